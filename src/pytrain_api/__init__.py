@@ -14,10 +14,10 @@ from importlib.metadata import PackageNotFoundError
 
 
 API_PACKAGE = "pytrain-ogr-api"
+API_NAME = "PyTrain Api"
 
 
 def main(args: list[str] | None = None) -> int:
-    from .endpoints import API_NAME
     from .pytrain_api import PyTrainApi
 
     if args is None:
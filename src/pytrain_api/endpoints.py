@@ -8,27 +8,35 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import mimetypes
 import os
 import re
 import secrets
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
+from functools import cached_property
 from typing import Annotated, Any, Callable, Iterable, TypeVar
 
 import jwt
 from dotenv import find_dotenv, load_dotenv
 from fastapi import APIRouter, Body, Depends, FastAPI, HTTPException, Path, Query, Request, Security, status
-from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, InvalidSignatureError, InvalidTokenError
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from pytrain import (
     PROGRAM_NAME,
     CommandReq,
     CommandScope,
+    PyTrain,
     TMCC1AuxCommandEnum,
     TMCC1HaltCommandEnum,
     TMCC1RouteCommandEnum,
@@ -41,10 +49,10 @@ from pytrain.protocol.command_def import CommandDefEnum
 from pytrain.protocol.tmcc1.tmcc1_constants import TMCC1EngineCommandEnum, TMCC1SyncCommandEnum
 from pytrain.utils.path_utils import find_dir
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, Response
 from starlette.staticfiles import StaticFiles
 
-from . import get_version
+from . import get_version as api_get_version
 from .pytrain_api import API_NAME, PyTrainApi
 from .pytrain_component import (
     AuxOption,
@@ -70,6 +78,7 @@ from .pytrain_info import (
     BlockInfo,
     Bpc2Command,
     ComponentInfo,
+    ComponentRef,
     EngineInfo,
     HornCommand,
     NumericCommand,
@@ -81,7 +90,14 @@ from .pytrain_info import (
     SwitchInfo,
     TrainInfo,
 )
-from .response_models import ErrorResponse, StatusResponse, SuccessResponse, VersionResponse, ok_response
+from .response_models import (
+    ApiTokenResponse,
+    ErrorResponse,
+    StatusResponse,
+    SuccessResponse,
+    VersionResponse,
+    ok_response,
+)
 
 log = logging.getLogger(__name__)
 
@@ -98,10 +114,13 @@ API_KEYS: dict[str, str] = dict()
 # Load environment variables that drive behavior
 load_dotenv(find_dotenv())
 SECRET_KEY = os.environ.get("SECRET_KEY")
+SIGNING_KEY = SECRET_KEY.encode() if SECRET_KEY else None
 SECRET_PHRASE = os.environ.get("SECRET_PHRASE") if os.environ.get("SECRET_PHRASE") else "PYTRAINAPI"
+SECRET_PHRASE_KEY = SECRET_PHRASE.encode()
 API_TOKEN = os.environ.get("API_TOKEN")
 UNSECURE_TOKENS = os.environ.get("UNSECURE_TOKENS")
 ALGORITHM = os.environ.get("ALGORITHM")
+ALGORITHMS = (ALGORITHM,)
 API_SERVER = os.environ.get("API_SERVER")
 ALEXA_TOKEN_EXP_MIN = os.environ.get("ALEXA_TOKEN_EXP_MIN")
 if ALEXA_TOKEN_EXP_MIN is None or int(ALEXA_TOKEN_EXP_MIN) <= 0:
@@ -111,6 +130,8 @@ else:
 
 if not API_SERVER or API_SERVER == DEFAULT_API_SERVER_VALUE:
     log.error("API_SERVER not set in .env; Alexa skill will not work")
+if not SECRET_KEY:
+    log.error("SECRET_KEY not set in .env; JWT API tokens will be rejected")
 
 # UNSECURE_TOKENS allows you to specify a comma-separated list of tokens that will bypass the API_TOKEN check.
 # This is useful for testing, but should never be used in production.
@@ -121,6 +142,25 @@ if UNSECURE_TOKENS:
         if token:
             API_KEYS[token] = token
 
+# Every registered raw key accepted by get_api_token; kept in step with API_KEYS by register_api_key.
+# JWT-shaped values are verified by signature, never looked up, so they aren't held here.
+_VALID_TOKENS: set[str] = {k for k in API_KEYS.values() if k and k.count(".") != 2}
+# API_TOKEN is the long-lived secret, so it is compared in constant time rather than by lookup
+_API_TOKEN_BYTES = API_TOKEN.encode() if API_TOKEN else None
+
+
+def register_api_key(key: str, value: str) -> None:
+    """
+    Records an accepted API key. A raw value is also added to the set used to
+    validate raw keys, and the value it replaces is no longer accepted.
+    """
+    previous = API_KEYS.get(key)
+    API_KEYS[key] = value
+    if previous is not None and previous != value:
+        _VALID_TOKENS.discard(previous)
+    if value and value.count(".") != 2:
+        _VALID_TOKENS.add(value)
+
 
 class Token(BaseModel):
     access_token: str
@@ -137,13 +177,19 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 @asynccontextmanager
 async def lifespan(fapp: FastAPI):
     api = PyTrainApi.get()
+    # uvicorn picks uvloop when it is installed; say so, so a silent fallback to asyncio is visible
+    loop = type(asyncio.get_running_loop())
+    log.info(f"Event loop: {loop.__module__}.{loop.__qualname__}")
 
     # register API server via zeroconf, enabling bonjour discovery
     await asyncio.to_thread(api.create_service)
     local_key = api.service_info.properties.get("uuid".encode("utf-8"), None)
     if local_key:
         local_key = local_key.decode("utf-8")
-        API_KEYS[local_key] = local_key
+        register_api_key(local_key, local_key)
+    # the route table is complete once the app starts, so build the schema now
+    # rather than on the first /openapi.json request
+    openapi_json()
     try:
         yield
     finally:
@@ -158,15 +204,51 @@ app = FastAPI(
     "This API is used by the Alexa skill and mobile apps. "
     "It is also used by the web UI and other third-party integrations.\n\n"
     "For more information, visit the [GitHub repository](https://github.com/cdswindell/pytrainapi).",
-    version=get_version(),
+    version=api_get_version(),
     docs_url=None,
+    openapi_url=None,
     lifespan=lifespan,
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Opt-in request profiling: with PYTRAIN_PROFILE set (and pyinstrument installed), adding
+# ?profile=1 to any authorized request returns a pyinstrument report instead of the response.
+# Only the event loop thread is sampled, so the bodies of plain def routes, which run in the
+# threadpool, show up as time spent awaiting their worker rather than as their own frames.
+if os.environ.get("PYTRAIN_PROFILE"):
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        log.warning("PYTRAIN_PROFILE is set but pyinstrument is not installed; profiling disabled")
+    else:
+
+        @app.middleware("http")
+        async def profile_request(request: Request, call_next):
+            if request.query_params.get("profile") != "1":
+                return await call_next(request)
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            response = await call_next(request)
+            profiler.stop()
+            if response.status_code >= 400:
+                return response
+            return HTMLResponse(profiler.output_html())
+
+
 api_key_header = APIKeyHeader(name="X-API-Key")
 
+# "magic" claim of the per-device tokens minted by /version
+GUID_BOOTSTRAP = "GUID_BOOTSTRAP"
+_DEFAULT_TOKEN_LIFETIME = int(timedelta(days=365).total_seconds())
 
-def create_api_token(data: dict = None, expires_delta: timedelta | None = None, secret=SECRET_KEY):
+
+def create_api_token(
+    data: dict = None,
+    expires_delta: timedelta | None = None,
+    secret: str | bytes = SIGNING_KEY,
+    magic: str = API_NAME,
+):
     """
     Creates a JSON Web Token (JWT) for API authentication. The method encodes the
     provided payload data and includes an expiration time for the token. Additionally,
@@ -176,20 +258,20 @@ def create_api_token(data: dict = None, expires_delta: timedelta | None = None,
         empty dictionary if no data is provided.
     :param expires_delta: An optional timedelta specifying how long the token is valid. If
         not provided, the token defaults to expiring in 365 days.
-    :param secret: A string value representing the secret key used to encode the token. Defaults
-        to SECRET_KEY if no secret is supplied.
+    :param secret: The secret key used to sign the token, as a string or bytes. Defaults to
+        SIGNING_KEY, the pre-encoded SECRET_KEY, if no secret is supplied.
+    :param magic: The token class recorded in the "magic" claim. Defaults to API_NAME; tokens
+        issued to Alexa via /version use GUID_BOOTSTRAP.
     :return: A string representing the encoded JWT.
     """
     if data is None:
         to_encode = {}
     else:
         to_encode = data.copy()
-    if expires_delta:
-        expire: datetime = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire: datetime = datetime.now(timezone.utc) + timedelta(days=365)
-    to_encode.update({"exp": expire})
-    to_encode.update({"magic": API_NAME})
+    # PyJWT takes "exp" as integer epoch seconds, so skip the datetime round-trip
+    lifetime = int(expires_delta.total_seconds()) if expires_delta else _DEFAULT_TOKEN_LIFETIME
+    to_encode["exp"] = int(time.time()) + lifetime
+    to_encode["magic"] = magic
     encoded_jwt = jwt.encode(to_encode, secret, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -221,6 +303,74 @@ def create_secret(length: int = 32) -> str:
 #     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing or invalid API key")
 
 
+# Recently verified JWTs, keyed by the BLAKE2b digest of the token. Each entry holds
+# (monotonic expiry, payload); a payload of None records a token whose signature failed.
+_JWT_CACHE: OrderedDict[bytes, tuple[float, dict | None]] = OrderedDict()
+_JWT_CACHE_MAX = 4096
+_JWT_CACHE_TTL = 5.0
+_JWT_REJECT_TTL = 1.0
+_JWT_CACHE_LOCK = threading.Lock()
+_INVALID_SIGNATURE = "Signature verification failed"
+_JWT_OPTIONS = {"require": ["exp", "magic"]}
+_JWT_LEEWAY = 5
+
+
+def _cache_jwt(key: bytes, expiry: float, payload: dict | None) -> None:
+    with _JWT_CACHE_LOCK:
+        _JWT_CACHE[key] = (expiry, payload)
+        _JWT_CACHE.move_to_end(key)
+        while len(_JWT_CACHE) > _JWT_CACHE_MAX:
+            _JWT_CACHE.popitem(last=False)
+
+
+def decode_api_token(api_key: str) -> dict:
+    """
+    Decodes and verifies a JWT, reusing the outcome of a recent verification of the
+    same token. Successful results are cached for at most _JWT_CACHE_TTL seconds and
+    never beyond the token's own expiration; bad signatures are remembered for
+    _JWT_REJECT_TTL seconds, and expired tokens are never cached.
+
+    :param api_key: The encoded JWT.
+    :return: The verified payload.
+    :raises HTTPException: 498 if the token has expired, 401 if it is otherwise invalid
+        or no SECRET_KEY is configured to verify it with.
+    """
+    if SIGNING_KEY is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="JWT API tokens are not enabled")
+    key = hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+    now = time.monotonic()
+    with _JWT_CACHE_LOCK:
+        entry = _JWT_CACHE.get(key)
+        if entry is not None:
+            expiry, payload = entry
+            if now < expiry:
+                _JWT_CACHE.move_to_end(key)
+                if payload is None:
+                    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=_INVALID_SIGNATURE)
+                return payload
+            del _JWT_CACHE[key]
+
+    try:
+        payload = jwt.decode(api_key, SIGNING_KEY, algorithms=ALGORITHMS, options=_JWT_OPTIONS, leeway=_JWT_LEEWAY)
+    except ExpiredSignatureError as es:
+        # Keep your 498 convention
+        raise HTTPException(status_code=498, detail=str(es))
+    except InvalidSignatureError:
+        _cache_jwt(key, now + _JWT_REJECT_TTL, None)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=_INVALID_SIGNATURE)
+    except (DecodeError, InvalidTokenError) as e:
+        # Covers "Not enough segments" and other malformed/invalid JWTs
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+    ttl = _JWT_CACHE_TTL
+    exp = payload.get("exp") if isinstance(payload, dict) else None
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        _cache_jwt(key, now + ttl, payload)
+    return payload
+
+
 def get_api_token(api_key: str = Security(api_key_header)) -> bool:
     """
     Accepts either:
@@ -237,87 +387,47 @@ def get_api_token(api_key: str = Security(api_key_header)) -> bool:
     api_key = api_key.strip()
 
     # If someone passed "Bearer <token>" in the header value, strip it.
-    if api_key.lower().startswith("bearer "):
-        api_key = api_key.split(" ", 1)[1].strip()
+    if api_key[:7].lower() == "bearer ":
+        api_key = api_key[7:].strip()
 
     # ---- path A: RAW API KEY ----
     # Treat anything not JWT-shaped as a raw key.
     is_jwt_shaped = api_key.count(".") == 2
 
     if not is_jwt_shaped:
-        if api_key == API_TOKEN:
+        if _API_TOKEN_BYTES and secrets.compare_digest(api_key.encode(), _API_TOKEN_BYTES):
+            return True
+        if api_key in _VALID_TOKENS:
             return True
-
-        # API_KEYS might be:
-        #  - a dict {guid: key}
-        #  - a set/list of keys
-        try:
-            if isinstance(API_KEYS, dict):
-                if api_key in API_KEYS.values():
-                    return True
-            else:
-                if api_key in API_KEYS:
-                    return True
-        except TypeError:
-            # In case API_KEYS isn't iterable / is misconfigured
-            pass
 
         log.warning(f"Invalid raw key access attempt: key={api_key!r}")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing or invalid API key")
 
     # ---- path B: JWT ----
-    try:
-        payload = jwt.decode(api_key, SECRET_KEY, algorithms=[ALGORITHM])
-    except ExpiredSignatureError as es:
-        # Keep your 498 convention
-        raise HTTPException(status_code=498, detail=str(es))
-    except (InvalidSignatureError, DecodeError, InvalidTokenError) as e:
-        # Covers "Not enough segments" and other malformed/invalid JWTs
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    payload = decode_api_token(api_key)
 
     # ---- JWT authorization rules ----
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing or invalid API key")
 
-    # 1) Magic/name check (you already had this)
-    if payload.get("magic") == API_NAME:
-        # For JWTs, consider them valid based on claims alone,
-        # OR optionally also require the token string to be known.
-        # Keeping your original behavior, but more flexible:
-        if api_key == API_TOKEN:
-            return True
-        try:
-            if isinstance(API_KEYS, dict):
-                if api_key in API_KEYS.values():
-                    return True
-            else:
-                if api_key in API_KEYS:
-                    return True
-        except TypeError:
-            pass
-
-        # If you want JWTs with correct signature+claims to be enough, uncomment this:
+    magic = payload["magic"]
+
+    # 1) API tokens; a correct signature and claims are enough
+    if magic == API_NAME:
         return True
 
-    # 2) Server/GUID flow you already had
-    if payload.get("SERVER") == API_SERVER:
+    # 2) Server/GUID tokens issued by /version
+    if magic == GUID_BOOTSTRAP and str(payload.get("SERVER", "")).lower() == API_SERVER:
         guid = payload.get("GUID")
         if guid:
-            if isinstance(API_KEYS, dict):
-                # If we already have this GUID and it matches, accept
-                if guid in API_KEYS and API_KEYS[guid] == api_key:
-                    return True
-
-                # If GUID exists but not stored yet, accept and store it
-                log.info(f"{guid} not in API_KEYS (or mismatch); storing JWT for future requests")
-                API_KEYS[guid] = api_key
+            # If we already have this GUID and it matches, accept
+            if API_KEYS.get(guid) == api_key:
                 return True
-            else:
-                # If API_KEYS isn't dict, we can't do GUID->token mapping
-                log.warning("API_KEYS is not a dict; cannot store GUID->token mapping for JWT auth")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, detail="Server token mapping not supported"
-                )
+
+            # If GUID exists but not stored yet, accept and store it
+            log.info(f"{guid} not in API_KEYS (or mismatch); storing JWT for future requests")
+            register_api_key(guid, api_key)
+            return True
 
     log.warning(f"Invalid JWT access attempt: payload={payload} token={api_key!r}")
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing or invalid API key")
@@ -591,6 +701,19 @@ def api_get(
 
 router = APIRouter(prefix="/pytrain/v1", dependencies=[Depends(get_api_token)])
 
+_PYTRAIN: PyTrain | None = None
+
+
+def _pytrain() -> PyTrain:
+    """
+    Returns the PyTrain server, looked up once per process.
+    """
+    global _PYTRAIN
+    if _PYTRAIN is None:
+        _PYTRAIN = PyTrainApi.get().pytrain
+    return _PYTRAIN
+
+
 FAVICON_PATH = None
 APPLE_ICON_PATH = None
 STATIC_DIR = find_dir("static", (".", "../"))
@@ -601,28 +724,81 @@ if STATIC_DIR:
     if os.path.isfile(f"{STATIC_DIR}/apple-touch-icon.png"):
         APPLE_ICON_PATH = FAVICON_PATH = f"{STATIC_DIR}/apple-touch-icon.png"
 
+ICON_CACHE_CONTROL = "public, max-age=86400"
+
+
+def weak_etag(data: bytes) -> str:
+    """
+    Returns a weak ETag for data. GZipMiddleware may serve the same tag on both
+    the compressed and identity bodies, which a strong tag may not.
+    """
+    return f'W/"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True if the request's If-None-Match is "*" or lists etag. As RFC 9110
+    requires for If-None-Match, tags are compared weakly.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+class StaticIcon:
+    """
+    An icon read once at startup and served from memory, with an ETag so
+    browsers can revalidate with a 304 rather than download it again.
+    """
+
+    def __init__(self, path: str | None) -> None:
+        self.content = None
+        self.media_type = None
+        self.etag = None
+        if path:
+            with open(path, "rb") as f:
+                self.content = f.read()
+            self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            self.etag = f'W/"{hashlib.md5(self.content, usedforsecurity=False).hexdigest()}"'
+
+    def response(self, request: Request) -> Response:
+        if self.content is None:
+            raise HTTPException(status_code=403)
+        headers = {"Cache-Control": ICON_CACHE_CONTROL, "ETag": self.etag}
+        if etag_matches(request, self.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=self.content, media_type=self.media_type, headers=headers)
+
+
+APPLE_ICON = StaticIcon(APPLE_ICON_PATH)
+FAVICON = StaticIcon(FAVICON_PATH)
+
 
 @app.get("/apple-touch-icon.png", include_in_schema=False)
 @app.get("/apple-touch-icon-precomposed.png", include_in_schema=False)
-async def apple_icon():
-    if APPLE_ICON_PATH:
-        return FileResponse(APPLE_ICON_PATH)
-    raise HTTPException(status_code=403)
+async def apple_icon(request: Request):
+    return APPLE_ICON.response(request)
 
 
 @app.get("/favicon.ico", include_in_schema=False)
-async def favicon():
-    if FAVICON_PATH:
-        return FileResponse(FAVICON_PATH)
-    raise HTTPException(status_code=403)
+async def favicon(request: Request):
+    return FAVICON.response(request)
+
+
+# unknown paths, which scanners and browsers probe constantly, all get this same reply
+_FORBIDDEN_BODY = JSONResponse(content={"detail": "Forbidden"}).body
 
 
 # noinspection PyUnusedLocal
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     # allow APIs that issue a legitimate 404 to send a 404 response
-    if exc.status_code in [404] and (not exc.headers or exc.headers.get("X-Error", None) not in {"404"}):
-        return JSONResponse(content={"detail": "Forbidden"}, status_code=403)
+    if exc.status_code == 404 and (not exc.headers or exc.headers.get("X-Error", None) != "404"):
+        return Response(content=_FORBIDDEN_BODY, status_code=status.HTTP_403_FORBIDDEN, media_type="application/json")
     return JSONResponse(content={"detail": exc.detail}, status_code=exc.status_code)
 
 
@@ -647,15 +823,18 @@ class Uid(BaseModel):
     uid: str
 
 
-@app.post("/version", summary=f"Get {PROGRAM_NAME} Version", include_in_schema=False)
+@app.post(
+    "/version",
+    summary=f"Get {PROGRAM_NAME} Version",
+    response_model=ApiTokenResponse,
+    include_in_schema=False,
+)
 def version(uid: Annotated[Uid, Body()]):
-    from . import get_version
-
     try:
-        uid_decoded = jwt.decode(uid.uid, API_SERVER, algorithms=[ALGORITHM])
+        uid_decoded = jwt.decode(uid.uid, API_SERVER, algorithms=ALGORITHMS)
     except InvalidSignatureError:
         try:
-            uid_decoded = jwt.decode(uid.uid, SECRET_PHRASE, algorithms=[ALGORITHM])
+            uid_decoded = jwt.decode(uid.uid, SECRET_PHRASE_KEY, algorithms=ALGORITHMS)
         except InvalidSignatureError:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     token_server = uid_decoded.get("SERVER", None)
@@ -670,22 +849,59 @@ def version(uid: Annotated[Uid, Body()]):
             "SERVER": token_server,
         },
         timedelta(minutes=ALEXA_TOKEN_EXP_MIN),
+        magic=GUID_BOOTSTRAP,
     )
-    API_KEYS[guid] = api_key
+    register_api_key(guid, api_key)
     return {
         "api-token": api_key,
         "pytrain": pytrain_get_version(),
-        "pytrain_api": get_version(),
+        "pytrain_api": api_get_version(),
     }
 
 
+DOCS_CACHE_CONTROL = "public, max-age=3600"
+
+_OPENAPI_JSON: bytes | None = None
+_SWAGGER_UI_HTML: bytes = get_swagger_ui_html(
+    openapi_url="/openapi.json",
+    title=f"{PROGRAM_NAME} API",
+    swagger_favicon_url="/static/favicon.ico",
+).body
+_REDOC_HTML: bytes = get_redoc_html(
+    openapi_url="/openapi.json",
+    title=f"{PROGRAM_NAME} API - ReDoc",
+    redoc_favicon_url="/static/favicon.ico",
+).body
+
+
+def openapi_json() -> bytes:
+    """
+    Returns the encoded OpenAPI schema, generating it on first use. Routes
+    don't change once the app is running, so it is built once per process.
+    """
+    global _OPENAPI_JSON
+    if _OPENAPI_JSON is None:
+        _OPENAPI_JSON = JSONResponse(app.openapi()).body
+    return _OPENAPI_JSON
+
+
+@app.get("/openapi.json", include_in_schema=False, tags=["Docs"])
+async def openapi_schema():
+    return Response(
+        content=openapi_json(),
+        media_type="application/json",
+        headers={"Cache-Control": DOCS_CACHE_CONTROL},
+    )
+
+
 @app.get("/docs", include_in_schema=False, tags=["Docs"])
 async def swagger_ui_html():
-    return get_swagger_ui_html(
-        openapi_url="/openapi.json",
-        title=f"{PROGRAM_NAME} API",
-        swagger_favicon_url="/static/favicon.ico",
-    )
+    return HTMLResponse(content=_SWAGGER_UI_HTML, headers={"Cache-Control": DOCS_CACHE_CONTROL})
+
+
+@app.get("/redoc", include_in_schema=False, tags=["Docs"])
+async def redoc_html():
+    return HTMLResponse(content=_REDOC_HTML, headers={"Cache-Control": DOCS_CACHE_CONTROL})
 
 
 @app.get("/pytrain", summary=f"Redirect to {API_NAME} Documentation", include_in_schema=False)
@@ -694,6 +910,29 @@ def pytrain_doc():
     return RedirectResponse(url="/docs", status_code=status.HTTP_301_MOVED_PERMANENTLY)
 
 
+# HALT takes no parameters; send() doesn't modify the request, so one instance serves every call
+_HALT_REQ = CommandReq(TMCC1HaltCommandEnum.HALT)
+
+
+def status_body(status: str) -> bytes:
+    """
+    Encodes a fixed SuccessResponse once, so constant replies skip response-model
+    validation and serialization on every call.
+    """
+    return ok_response(status).model_dump_json().encode()
+
+
+def status_reply(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+_HALT_SENT = status_body("HALT command sent")
+
+# (command, encoded reply) pairs for the on/off system toggles, indexed by the requested setting
+_DEBUG_TOGGLE = (("debug off", status_body("Debugging disabled")), ("debug on", status_body("Debugging enabled")))
+_ECHO_TOGGLE = (("echo off", status_body("Echo disabled")), ("echo on", status_body("Echo enabled")))
+
+
 @api_get(
     router,
     "/system/halt",
@@ -701,10 +940,10 @@ def pytrain_doc():
     description="Stops all engines and trains, in their tracks; turns off all power districts.",
     name="System.Halt",
 )
-async def halt() -> StatusResponse:
+def halt() -> StatusResponse:
     try:
-        CommandReq(TMCC1HaltCommandEnum.HALT).send()
-        return ok_response("HALT command sent")
+        _HALT_REQ.send()
+        return status_reply(_HALT_SENT)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -723,9 +962,10 @@ async def halt() -> StatusResponse:
     description=f"Enable/disable {PROGRAM_NAME} debugging mode. ",
     name="System.Debug",
 )
-async def debug(on: bool = True) -> StatusResponse:
-    PyTrainApi.get().pytrain.queue_command(f"debug {'on' if on else 'off'}")
-    return ok_response(f"Debugging {'enabled' if on else 'disabled'}")
+def debug(on: bool = True) -> StatusResponse:
+    cmd, body = _DEBUG_TOGGLE[on]
+    _pytrain().queue_command(cmd)
+    return status_reply(body)
 
 
 @legacy_post(
@@ -742,9 +982,10 @@ async def debug(on: bool = True) -> StatusResponse:
     description=f"Enable/disable echoing of {PROGRAM_NAME} commands to log file. ",
     name="System.Echo",
 )
-async def echo(on: bool = True) -> StatusResponse:
-    PyTrainApi.get().pytrain.queue_command(f"echo {'on' if on else 'off'}")
-    return ok_response(f"Echo {'enabled' if on else 'disabled'}")
+def echo(on: bool = True) -> StatusResponse:
+    cmd, body = _ECHO_TOGGLE[on]
+    _pytrain().queue_command(cmd)
+    return status_reply(body)
 
 
 @legacy_post(
@@ -761,7 +1002,7 @@ async def echo(on: bool = True) -> StatusResponse:
     description=f"Reboot {PROGRAM_NAME} server and all clients.",
     name="System.Reboot",
 )
-async def reboot() -> StatusResponse:
+def reboot() -> StatusResponse:
     try:
         CommandReq(TMCC1SyncCommandEnum.REBOOT).send()
         return ok_response("REBOOT command sent")
@@ -783,7 +1024,7 @@ async def reboot() -> StatusResponse:
     description=f"Restart {PROGRAM_NAME} server and all clients.",
     name="System.Restart",
 )
-async def restart() -> StatusResponse:
+def restart() -> StatusResponse:
     try:
         CommandReq(TMCC1SyncCommandEnum.RESTART).send()
         return ok_response("RESTART command sent")
@@ -805,7 +1046,7 @@ async def restart() -> StatusResponse:
     description="Reload all state information from Lionel Base 3.",
     name="System.Resync",
 )
-async def resync() -> StatusResponse:
+def resync() -> StatusResponse:
     try:
         CommandReq(TMCC1SyncCommandEnum.RESYNC).send()
         return ok_response("RESYNC command sent")
@@ -827,7 +1068,7 @@ async def resync() -> StatusResponse:
     description=f"Shutdown {PROGRAM_NAME} server and all clients.",
     name="System.Shutdown",
 )
-async def shutdown() -> StatusResponse:
+def shutdown() -> StatusResponse:
     try:
         CommandReq(TMCC1SyncCommandEnum.SHUTDOWN).send()
         return ok_response("SHUTDOWN command sent")
@@ -835,12 +1076,20 @@ async def shutdown() -> StatusResponse:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# requests never change once built, so the stop-all pair is encoded once and resent as-is
+_STOP_ALL_REQS = (
+    CommandReq(TMCC1EngineCommandEnum.STOP_IMMEDIATE, 99),
+    CommandReq(TMCC2EngineCommandEnum.STOP_IMMEDIATE, 99, scope=CommandScope.TRAIN),
+)
+_STOP_ALL_SENT = status_body("Sent 'stop' command to all engines and trains...")
+
+
 @legacy_post(router, "/system/stop_all_req", name="System.StopAllReq", summary="Stop All Engines and Trains")
 @mobile_post(router, "/system/stop_all", name="System.StopAll", summary="Stop All Engines and Trains")
-async def stop_all() -> StatusResponse:
-    CommandReq(TMCC1EngineCommandEnum.STOP_IMMEDIATE, 99).send()
-    CommandReq(TMCC2EngineCommandEnum.STOP_IMMEDIATE, 99, scope=CommandScope.TRAIN).send()
-    return ok_response("Sent 'stop' command to all engines and trains...")
+def stop_all() -> StatusResponse:
+    for req in _STOP_ALL_REQS:
+        req.send()
+    return status_reply(_STOP_ALL_SENT)
 
 
 @legacy_post(
@@ -857,7 +1106,7 @@ async def stop_all() -> StatusResponse:
     description=f"Update {API_NAME} software from PyPi or Git Hub repository.",
     name="System.Update",
 )
-async def update() -> StatusResponse:
+def update() -> StatusResponse:
     try:
         CommandReq(TMCC1SyncCommandEnum.UPDATE).send()
         return ok_response("UPDATE command sent")
@@ -885,13 +1134,37 @@ async def update() -> StatusResponse:
 )
 async def get_version() -> VersionResponse:
     try:
-        from . import get_version as api_get_version
-
         return VersionResponse(pytrain=pytrain_get_version(), pytrain_api=api_get_version())
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+_ENGINE_LIKE = frozenset((Component.ENGINE, Component.TRAIN))
+_CLI_CACHE: OrderedDict[str, CommandReq] = OrderedDict()
+_CLI_CACHE_MAX = 256
+_CLI_CACHE_LOCK = threading.Lock()
+
+
+def parse_cli(cmd: str) -> CommandReq | str | None:
+    """
+    Parses a CLI command line, reusing the request built the last time the same line
+    was parsed. Only plain CommandReqs are cached: they are not modified when sent,
+    whereas sequence requests carry per-send state and are parsed afresh.
+    """
+    with _CLI_CACHE_LOCK:
+        req = _CLI_CACHE.get(cmd)
+        if req is not None:
+            _CLI_CACHE.move_to_end(cmd)
+            return req
+    req = _pytrain().parse_cli(cmd)
+    if type(req) is CommandReq:
+        with _CLI_CACHE_LOCK:
+            _CLI_CACHE[cmd] = req
+            while len(_CLI_CACHE) > _CLI_CACHE_MAX:
+                _CLI_CACHE.popitem(last=False)
+    return req
+
+
 # noinspection PathParameterInspection
 @router.post(
     "/{component}/{tmcc_id:int}/cli_req",
@@ -899,7 +1172,7 @@ async def get_version() -> VersionResponse:
     description=f"Send a {PROGRAM_NAME} CLI command to control trains, switches, and accessories.",
     include_in_schema=False,
 )
-async def send_command(
+def send_command(
     component: Component,
     tmcc_id: Annotated[
         int,
@@ -914,12 +1187,9 @@ async def send_command(
     is_tmcc: Annotated[str | None, Query(description="Send TMCC-style commands")] = None,
 ) -> StatusResponse:
     try:
-        if component in [Component.ENGINE, Component.TRAIN]:
-            tmcc = " -tmcc" if is_tmcc is not None else ""
-        else:
-            tmcc = ""
+        tmcc = " -tmcc" if is_tmcc is not None and component in _ENGINE_LIKE else ""
         cmd = f"{component.value} {tmcc_id}{tmcc} {command}"
-        parse_response = PyTrainApi.get().pytrain.parse_cli(cmd)
+        parse_response = parse_cli(cmd)
         if isinstance(parse_response, CommandReq):
             parse_response.send()
             return ok_response(f"'{cmd}' command sent")
@@ -931,32 +1201,228 @@ async def send_command(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+class ComponentIndex:
+    """
+    Partitions and parallel lists describing the states of one scope, so repeated
+    list queries don't re-derive the filter attributes of every state. Each is
+    built the first time a query needs it; the index is discarded as soon as any
+    state in the scope is added or updated.
+    """
+
+    MAX_SEARCHES = 64
+
+    def __init__(self, fingerprint: tuple, states: list) -> None:
+        self.fingerprint = fingerprint
+        self.states = states
+        self._contains: dict[str, frozenset[int]] = dict()
+
+    @cached_property
+    def by_legacy(self) -> dict[Any, tuple[int, ...]]:
+        return self._partition("is_legacy")
+
+    @cached_property
+    def by_tmcc(self) -> dict[Any, tuple[int, ...]]:
+        return self._partition("is_tmcc")
+
+    def _partition(self, attr: str) -> dict[Any, tuple[int, ...]]:
+        parts: dict[Any, list[int]] = dict()
+        for i, state in enumerate(self.states):
+            parts.setdefault(getattr(state, attr), []).append(i)
+        return {value: tuple(positions) for value, positions in parts.items()}
+
+    @cached_property
+    def text(self) -> list[str]:
+        return [str(state).lower() for state in self.states]
+
+    def containing(self, needle: str) -> frozenset[int]:
+        """
+        Returns the positions of the states whose text contains needle, remembering
+        the answer so repeated searches for the same term don't rescan the scope.
+        """
+        needle = needle.lower()
+        hits = self._contains.get(needle, None)
+        if hits is None:
+            if len(self._contains) >= self.MAX_SEARCHES:
+                self._contains.clear()
+            hits = self._contains[needle] = frozenset(i for i, text in enumerate(self.text) if needle in text)
+        return hits
+
+
+# scopes whose as_dict() reads other states: a route's "active" follows its switches and
+# sub-routes, a train's "components" its consist. Those changes don't touch last_updated,
+# so nothing keyed on it is cached for these scopes.
+_DERIVED_SCOPES = frozenset((CommandScope.ROUTE, CommandScope.TRAIN))
+
+_COMPONENT_INDEX: dict[CommandScope, ComponentIndex] = dict()
+
+
+def component_index(scope: CommandScope, states: list) -> ComponentIndex:
+    fingerprint = tuple((state.address, state.last_updated) for state in states)
+    if scope in _DERIVED_SCOPES:
+        # a route's text includes whether it is active, which last_updated doesn't track
+        return ComponentIndex(fingerprint, states)
+    index = _COMPONENT_INDEX.get(scope, None)
+    if index is None or index.fingerprint != fingerprint:
+        index = _COMPONENT_INDEX[scope] = ComponentIndex(fingerprint, states)
+    return index
+
+
+# as_dict() of each state as of its last update, keyed by (scope, address)
+_STATE_DICTS: dict[tuple[CommandScope, int], tuple[Any, float | None, dict[str, Any]]] = dict()
+
+
+def state_dict(scope: CommandScope, state) -> dict[str, Any]:
+    """
+    Returns a copy of state.as_dict(), rebuilding it only when the state has been
+    updated since it was last converted. A copy is returned because model
+    validators (e.g., AccessoryInfo) normalize the dict they are given in place.
+    States in derived scopes are converted on every call.
+    """
+    if scope in _DERIVED_SCOPES:
+        return state.as_dict()
+    key = (scope, state.address)
+    cached = _STATE_DICTS.get(key, None)
+    if cached is None or cached[0] is not state or cached[1] != state.last_updated:
+        cached = _STATE_DICTS[key] = (state, state.last_updated, state.as_dict())
+    return dict(cached[2])
+
+
+# encoded single-component responses and their ETags, keyed by (scope, address);
+# rebuilt when the state is updated
+_STATE_BODIES: dict[tuple[CommandScope, int], tuple[Any, float | None, bytes, str]] = dict()
+
+
+def component_body(component: PyTrainComponent, tmcc_id: int, model: type[BaseModel]) -> tuple[bytes, str]:
+    """
+    Returns the encoded state of one component as the given model, and its ETag,
+    re-validating and re-encoding it only when the state has been updated since
+    it was last encoded. Components in derived scopes are encoded on every call.
+    """
+    state = component.state(tmcc_id)
+    key = (component.scope, tmcc_id)
+    derived = component.scope in _DERIVED_SCOPES
+    cached = None if derived else _STATE_BODIES.get(key, None)
+    if cached is None or cached[0] is not state or cached[1] != state.last_updated:
+        stamp = state.last_updated
+        body = model(**state_dict(component.scope, state)).model_dump_json(by_alias=True).encode()
+        etag = weak_etag(body)
+        cached = (state, stamp, body, etag)
+        if not derived:
+            _STATE_BODIES[key] = cached
+    return cached[2], cached[3]
+
+
+def get_component(request: Request, component: PyTrainComponent, tmcc_id: int, model: type[BaseModel]) -> Response:
+    """
+    Returns the encoded state of one component. The response carries an ETag of the
+    body; a client presenting it in If-None-Match gets a 304 while the component is
+    unchanged.
+    """
+    body, etag = component_body(component, tmcc_id, model)
+    headers = {"ETag": etag}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def scope_index(scope: CommandScope) -> ComponentIndex:
+    states = _pytrain().store.query(scope)
+    if states is None:
+        headers = {"X-Error": "404"}
+        raise HTTPException(status_code=404, headers=headers, detail=f"No {scope.label} found")
+    return component_index(scope, states)
+
+
 def get_components(
     scope: CommandScope,
     contains: str = None,
     is_legacy: bool = None,
     is_tmcc: bool = None,
+    index: ComponentIndex = None,
 ) -> list[dict[str, Any]]:
-    states = PyTrainApi.get().pytrain.store.query(scope)
-    if states is None:
+    index = index if index is not None else scope_index(scope)
+    matches = range(len(index.states))
+    if is_legacy is not None:
+        matches = index.by_legacy.get(is_legacy, ())
+    if is_tmcc is not None:
+        tmcc = index.by_tmcc.get(is_tmcc, ())
+        matches = tmcc if is_legacy is None else sorted(set(matches).intersection(tmcc))
+    if contains:
+        hits = index.containing(contains)
+        matches = [i for i in matches if i in hits]
+    states = index.states
+    ret = [state_dict(scope, states[i]) for i in matches]
+    if not ret:
         headers = {"X-Error": "404"}
-        raise HTTPException(status_code=404, headers=headers, detail=f"No {scope.label} found")
+        raise HTTPException(status_code=404, headers=headers, detail=f"No matching {scope.label} found")
+    return ret
+
+
+# encoded list responses, keyed by ETag; a tag changes whenever any state in its scope does
+_LIST_BODIES: OrderedDict[str, bytes] = OrderedDict()
+_LIST_BODIES_MAX = 64
+_LIST_BODIES_LOCK = threading.Lock()
+
+
+def list_components(
+    request: Request,
+    scope: CommandScope,
+    adapter: TypeAdapter,
+    contains: str = None,
+    is_legacy: bool = None,
+    is_tmcc: bool = None,
+) -> Response:
+    """
+    Returns the encoded list of matching components, tagged with an ETag derived
+    from the scope's fingerprint and the query. A client presenting the current tag
+    in If-None-Match gets a 304, and repeat queries against an unchanged scope are
+    answered from the previously encoded body. Lists of derived scopes are encoded
+    on every request and tagged with a hash of the body instead.
+    """
+    index = scope_index(scope)
+    body = None
+    if scope in _DERIVED_SCOPES:
+        body = encode_components(adapter, scope, contains, is_legacy, is_tmcc, index)
+        key = body
     else:
-        ret = list()
-        contains = contains.lower() if contains else None
-        for state in states:
-            if is_legacy is not None and state.is_legacy != is_legacy:
-                continue
-            if is_tmcc is not None and state.is_tmcc != is_tmcc:
-                continue
-            # noinspection PyUnresolvedReferences
-            if contains and state and contains not in str(state).lower():
-                continue
-            ret.append(state.as_dict())
-        if not ret:
-            headers = {"X-Error": "404"}
-            raise HTTPException(status_code=404, headers=headers, detail=f"No matching {scope.label} found")
-        return ret
+        key = repr((scope, index.fingerprint, contains, is_legacy, is_tmcc)).encode()
+    etag = weak_etag(key)
+    headers = {"ETag": etag}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if body is None:
+        with _LIST_BODIES_LOCK:
+            body = _LIST_BODIES.get(etag, None)
+            if body is not None:
+                _LIST_BODIES.move_to_end(etag)
+    if body is None:
+        body = encode_components(adapter, scope, contains, is_legacy, is_tmcc, index)
+        with _LIST_BODIES_LOCK:
+            _LIST_BODIES[etag] = body
+            while len(_LIST_BODIES) > _LIST_BODIES_MAX:
+                _LIST_BODIES.popitem(last=False)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def encode_components(
+    adapter: TypeAdapter,
+    scope: CommandScope,
+    contains: str | None,
+    is_legacy: bool | None,
+    is_tmcc: bool | None,
+    index: ComponentIndex,
+) -> bytes:
+    components = adapter.validate_python(get_components(scope, contains, is_legacy, is_tmcc, index=index))
+    return adapter.dump_json(components, by_alias=True)
+
+
+# validate a whole component list in one pass, rather than one model construction per state
+_ACC_LIST_ADAPTER = TypeAdapter(list[AccessoryInfo])
+_BLOCK_LIST_ADAPTER = TypeAdapter(list[BlockInfo])
+_ENGINE_LIST_ADAPTER = TypeAdapter(list[EngineInfo])
+_ROUTE_LIST_ADAPTER = TypeAdapter(list[RouteInfo])
+_SWITCH_LIST_ADAPTER = TypeAdapter(list[SwitchInfo])
+_TRAIN_LIST_ADAPTER = TypeAdapter(list[TrainInfo])
 
 
 @api_get(
@@ -967,8 +1433,8 @@ def get_components(
     response_model=list[AccessoryInfo],
     include_404=True,
 )
-async def get_accessories(contains: str = None) -> list[AccessoryInfo]:
-    return [AccessoryInfo(**d) for d in get_components(CommandScope.ACC, contains=contains)]
+def get_accessories(request: Request, contains: str = None) -> list[AccessoryInfo]:
+    return list_components(request, CommandScope.ACC, _ACC_LIST_ADAPTER, contains=contains)
 
 
 class Accessory(PyTrainAccessory):
@@ -977,6 +1443,7 @@ class Accessory(PyTrainAccessory):
 
 
 _accessory = Accessory()
+AccessoryId = Annotated[int, PyTrainComponent.id_path(label="Accessory")]
 
 
 @api_get(
@@ -987,15 +1454,16 @@ _accessory = Accessory()
     response_model=AccessoryInfo,
     include_404=True,
 )
-async def get_accessory(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def get_accessory(
+    request: Request,
+    tmcc_id: AccessoryId,
 ) -> AccessoryInfo:
-    return AccessoryInfo(**_accessory.get(tmcc_id))
+    return get_component(request, _accessory, tmcc_id, AccessoryInfo)
 
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/amc2_motor_req", name="Accessory.Amc2MotorReq")
-async def acc_amc2_motor_req(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_amc2_motor_req(
+    tmcc_id: AccessoryId,
     motor: Annotated[int, Query(description="Motor (1 - 2)", ge=1, le=2)],
     state: Annotated[OnOffOption | None, Query(description="On or Off")] = None,
     speed: Annotated[int | None, Query(description="Speed (0 - 100)", ge=0, le=100)] = None,
@@ -1009,8 +1477,8 @@ async def acc_amc2_motor_req(
     name="Accessory.Amc2Motor",
     errors=(404,),
 )
-async def acc_amc2_motor_cmd(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_amc2_motor_cmd(
+    tmcc_id: AccessoryId,
     cmd: Amc2MotorCommand = Body(...),
 ) -> StatusResponse:
     motor = cmd.motor
@@ -1021,8 +1489,8 @@ async def acc_amc2_motor_cmd(
 
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/amc2_lamp_req", name="Accessory.Amc2LampReq")
-async def acc_amc2_lamp_req(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_amc2_lamp_req(
+    tmcc_id: AccessoryId,
     lamp: Annotated[int, Query(description="Lamp (1 - 4)", ge=1, le=4)],
     state: Annotated[OnOffOption | None, Query(description="On or Off")] = None,
     level: Annotated[int | None, Query(description="Brightness Level (0 - 100)", ge=0, le=100)] = None,
@@ -1036,8 +1504,8 @@ async def acc_amc2_lamp_req(
     name="Accessory.Amc2Lamp",
     errors=(404,),
 )
-async def acc_amc2_lamp_cmd(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_amc2_lamp_cmd(
+    tmcc_id: AccessoryId,
     cmd: Amc2LampCommand = Body(...),
 ) -> StatusResponse:
     lamp = cmd.lamp
@@ -1048,8 +1516,8 @@ async def acc_amc2_lamp_cmd(
 
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/asc2_req", name="Accessory.Asc2Req")
-async def acc_asc2_req(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_asc2_req(
+    tmcc_id: AccessoryId,
     state: Annotated[OnOffOption | None, Query(description="On or Off")],
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
@@ -1057,8 +1525,8 @@ async def acc_asc2_req(
 
 
 @mobile_post(router, "/accessory/{tmcc_id:int}/asc2", name="Accessory.Asc2", errors=(404,))
-async def acc_asc2_cmd(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_asc2_cmd(
+    tmcc_id: AccessoryId,
     cmd: Asc2Command = Body(...),
 ) -> StatusResponse:
     state = cmd.state
@@ -1068,8 +1536,8 @@ async def acc_asc2_cmd(
 
 
 @mobile_post(router, "/accessory/{tmcc_id:int}/aux", name="Accessory.Aux")
-async def acc_aux_cmd(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_aux_cmd(
+    tmcc_id: AccessoryId,
     cmd: AuxCommand = Body(...),
 ) -> StatusResponse:
     return _accessory.aux(tmcc_id, cmd.aux_req, cmd.number, cmd.duration)
@@ -1077,8 +1545,8 @@ async def acc_aux_cmd(
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/boost_req", name="Accessory.BoostReq")
 @mobile_post(router, "/accessory/{tmcc_id:int}/boost", name="Accessory.Boost")
-async def acc_boost(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_boost(
+    tmcc_id: AccessoryId,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
     return _accessory.boost(tmcc_id, duration)
@@ -1086,24 +1554,24 @@ async def acc_boost(
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/brake_req", name="Accessory.BrakeReq")
 @mobile_post(router, "/accessory/{tmcc_id:int}/brake", name="Accessory.Brake")
-async def acc_brake(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_brake(
+    tmcc_id: AccessoryId,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
     return _accessory.brake(tmcc_id, duration)
 
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/bpc2_req", name="Accessory.Bpc2Req")
-async def acc_bpc2_req(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_bpc2_req(
+    tmcc_id: AccessoryId,
     state: Annotated[OnOffOption, Query(description="On or Off")],
 ) -> StatusResponse:
     return _accessory.bpc2(tmcc_id, state)
 
 
 @mobile_post(router, "/accessory/{tmcc_id:int}/bpc", name="Accessory.Bpc2", errors=(404,))
-async def acc_bpc2_cmd(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_bpc2_cmd(
+    tmcc_id: AccessoryId,
     cmd: Bpc2Command = Body(...),
 ) -> StatusResponse:
     state = cmd.state
@@ -1113,16 +1581,16 @@ async def acc_bpc2_cmd(
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/front_coupler_req", name="Accessory.FrontCouplerReq")
 @mobile_post(router, "/accessory/{tmcc_id:int}/front_coupler", name="Accessory.FrontCoupler")
-async def acc_front_coupler(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_front_coupler(
+    tmcc_id: AccessoryId,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
     return _accessory.open_coupler(tmcc_id, TMCC1AuxCommandEnum.FRONT_COUPLER, duration)
 
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/numeric_req", name="Accessory.NumericReq")
-async def acc_numeric_req(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_numeric_req(
+    tmcc_id: AccessoryId,
     number: Annotated[int | None, Query(description="Number (0 - 9)", ge=0, le=9)] = None,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
@@ -1130,8 +1598,8 @@ async def acc_numeric_req(
 
 
 @mobile_post(router, "/accessory/{tmcc_id:int}/numeric", name="Accessory.Numeric")
-async def acc_numeric_cmd(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_numeric_cmd(
+    tmcc_id: AccessoryId,
     cmd: Annotated[NumericCommand, Body(...)],
 ) -> StatusResponse:
     return _accessory.do_numeric(TMCC1AuxCommandEnum.NUMERIC, tmcc_id, cmd.number, cmd.duration)
@@ -1139,16 +1607,16 @@ async def acc_numeric_cmd(
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/rear_coupler_req", name="Accessory.RearCouplerReq")
 @mobile_post(router, "/accessory/{tmcc_id:int}/rear_coupler", name="Accessory.RearCoupler")
-async def acc_rear_coupler(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_rear_coupler(
+    tmcc_id: AccessoryId,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
     return _accessory.open_coupler(tmcc_id, TMCC1AuxCommandEnum.REAR_COUPLER, duration)
 
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/speed_req/{speed}", name="Accessory.SpeedReq")
-async def acc_speed(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_speed(
+    tmcc_id: AccessoryId,
     speed: Annotated[int, Path(description="Relative speed (-5 - 5)", ge=-5, le=5)],
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
@@ -1156,16 +1624,16 @@ async def acc_speed(
 
 
 @mobile_post(router, "/accessory/{tmcc_id:int}/speed", name="Accessory.Speed")
-async def acc_speed_cmd(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_speed_cmd(
+    tmcc_id: AccessoryId,
     cmd: RelativeSpeedCommand = Body(...),
 ) -> StatusResponse:
     return _accessory.relative_speed(tmcc_id, cmd.speed, cmd.duration)
 
 
 @legacy_post(router, "/accessory/{tmcc_id:int}/{aux_req}", name="Accessory.AuxReq")
-async def acc_operate_accessory(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Accessory")],
+def acc_operate_accessory(
+    tmcc_id: AccessoryId,
     aux_req: Annotated[AuxOption, Path(description="Aux 1, Aux2, or Aux 3")],
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
@@ -1180,8 +1648,8 @@ async def acc_operate_accessory(
     response_model=list[BlockInfo],
     include_404=True,
 )
-async def get_blocks(contains: str = None) -> list[BlockInfo]:
-    return [BlockInfo(**d) for d in get_components(CommandScope.BLOCK, contains=contains)]
+def get_blocks(request: Request, contains: str = None) -> list[BlockInfo]:
+    return list_components(request, CommandScope.BLOCK, _BLOCK_LIST_ADAPTER, contains=contains)
 
 
 class Block(PyTrainComponent):
@@ -1211,10 +1679,11 @@ _block = Block()
     response_model=BlockInfo,
     include_404=True,
 )
-async def get_block(
+def get_block(
+    request: Request,
     block_id: Annotated[int, Block.id_path(label="Block")],
 ) -> BlockInfo:
-    return BlockInfo(**_block.get(block_id))
+    return get_component(request, _block, block_id, BlockInfo)
 
 
 @api_get(
@@ -1225,16 +1694,20 @@ async def get_block(
     response_model=list[EngineInfo],
     include_404=True,
 )
-async def get_engines(contains: str = None, is_legacy: bool = None, is_tmcc: bool = None) -> list[EngineInfo]:
-    return [
-        EngineInfo(**d)
-        for d in get_components(
-            CommandScope.ENGINE,
-            is_legacy=is_legacy,
-            is_tmcc=is_tmcc,
-            contains=contains,
-        )
-    ]
+def get_engines(
+    request: Request,
+    contains: str = None,
+    is_legacy: bool = None,
+    is_tmcc: bool = None,
+) -> list[EngineInfo]:
+    return list_components(
+        request,
+        CommandScope.ENGINE,
+        _ENGINE_LIST_ADAPTER,
+        contains=contains,
+        is_legacy=is_legacy,
+        is_tmcc=is_tmcc,
+    )
 
 
 class Engine(PyTrainEngine):
@@ -1254,6 +1727,7 @@ class Engine(PyTrainEngine):
 
 
 _engine = Engine()
+EngineId = Annotated[int, Engine.id_path()]
 
 
 @api_get(
@@ -1264,23 +1738,24 @@ _engine = Engine()
     response_model=EngineInfo,
     include_404=True,
 )
-async def get_engine(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def get_engine(
+    request: Request,
+    tmcc_id: EngineId,
 ) -> EngineInfo:
-    return EngineInfo(**_engine.get(tmcc_id))
+    return get_component(request, _engine, tmcc_id, EngineInfo)
 
 
 @mobile_post(router, "/engine/{tmcc_id:int}/aux", name="Engine.Aux")
-async def eng_aux_cmd(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_aux_cmd(
+    tmcc_id: EngineId,
     cmd: AuxCommand = Body(...),
 ) -> StatusResponse:
     return _engine.aux(tmcc_id, cmd.aux_req, cmd.number, cmd.duration)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/bell_req", name="Engine.BellReq")
-async def ring_bell_req(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def ring_bell_req(
+    tmcc_id: EngineId,
     option: Annotated[
         BellOption | None,
         Query(description="Bell effect (omit to toggle)"),
@@ -1294,8 +1769,8 @@ async def ring_bell_req(
 
 
 @mobile_post(router, "/engine/{tmcc_id:int}/bell", name="Engine.Bell")
-async def ring_bell_cmd(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def ring_bell_cmd(
+    tmcc_id: EngineId,
     cmd: Annotated[BellCommand, Body(..., discriminator="option")],
 ) -> StatusResponse:
     option = cmd.option
@@ -1306,8 +1781,8 @@ async def ring_bell_cmd(
 
 @legacy_post(router, "/engine/{tmcc_id:int}/boost_req", name="Engine.BoostReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/boost", name="Engine.Boost")
-async def engine_boost(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def engine_boost(
+    tmcc_id: EngineId,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
     return _engine.boost(tmcc_id, duration)
@@ -1315,8 +1790,8 @@ async def engine_boost(
 
 @legacy_post(router, "/engine/{tmcc_id:int}/brake_req", name="Engine.BrakeReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/brake", name="Engine.Brake")
-async def engine_brake(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def engine_brake(
+    tmcc_id: EngineId,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
     return _engine.brake(tmcc_id, duration)
@@ -1324,8 +1799,8 @@ async def engine_brake(
 
 @legacy_post(router, "/engine/{tmcc_id:int}/dialog_req", name="Engine.DialogReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/dialog", name="Engine.Dialog")
-async def dialog_req(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def dialog_req(
+    tmcc_id: EngineId,
     dialog: DialogOption = Query(..., description="Dialog effect"),
 ) -> StatusResponse:
     return _engine.dialog(tmcc_id, dialog)
@@ -1333,23 +1808,23 @@ async def dialog_req(
 
 @legacy_post(router, "/engine/{tmcc_id:int}/forward_req", name="Engine.ForwardReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/forward", name="Engine.Forward")
-async def forward_req(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def forward_req(
+    tmcc_id: EngineId,
 ) -> StatusResponse:
     return _engine.forward(tmcc_id)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/front_coupler_req", name="Engine.FrontCouplerReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/front_coupler", name="Engine.FrontCoupler")
-async def eng_front_coupler(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_front_coupler(
+    tmcc_id: EngineId,
 ) -> StatusResponse:
     return _engine.front_coupler(tmcc_id)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/horn_req", name="Engine.HornReq")
-async def blow_horn_req(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def blow_horn_req(
+    tmcc_id: EngineId,
     option: Annotated[HornOption, Query(description="Horn/whistle effect")],
     intensity: Annotated[
         int | None,
@@ -1368,8 +1843,8 @@ async def blow_horn_req(
 
 
 @mobile_post(router, "/engine/{tmcc_id:int}/horn", name="Engine.Horn")
-async def blow_horn_cmd(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def blow_horn_cmd(
+    tmcc_id: EngineId,
     cmd: Annotated[HornCommand, Body(..., discriminator="option")],
 ) -> StatusResponse:
     option = cmd.option
@@ -1386,24 +1861,24 @@ async def blow_horn_cmd(
     response_model=ProductInfo,
     include_404=True,
 )
-async def get_info(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def get_info(
+    tmcc_id: EngineId,
 ) -> ProductInfo:
     return ProductInfo(**_engine.get_engine_info(tmcc_id))
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/momentum_req", name="Engine.MomentumReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/momentum", name="Engine.Momentum")
-async def momentum(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def momentum(
+    tmcc_id: EngineId,
     level: int = Query(..., ge=0, le=7, description="Momentum level (0 - 7)"),
 ) -> StatusResponse:
     return _engine.momentum(tmcc_id, level)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/numeric_req", name="Engine.NumericReq")
-async def eng_numeric_req(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_numeric_req(
+    tmcc_id: EngineId,
     number: Annotated[int | None, Query(description="Number (0 - 9)", ge=0, le=9)],
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
@@ -1411,8 +1886,8 @@ async def eng_numeric_req(
 
 
 @mobile_post(router, "/engine/{tmcc_id:int}/numeric", name="Engine.Numeric")
-async def eng_numeric_cmd(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_numeric_cmd(
+    tmcc_id: EngineId,
     cmd: Annotated[NumericCommand, Body(...)],
 ) -> StatusResponse:
     return _engine.numeric(tmcc_id, cmd.number, cmd.duration)
@@ -1420,15 +1895,15 @@ async def eng_numeric_cmd(
 
 @legacy_post(router, "/engine/{tmcc_id:int}/rear_coupler_req", name="Engine.RearCouplerReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/rear_coupler", name="Engine.RearCoupler")
-async def eng_rear_coupler(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_rear_coupler(
+    tmcc_id: EngineId,
 ) -> StatusResponse:
     return _engine.rear_coupler(tmcc_id)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/reset_req", name="Engine.ResetReq")
-async def reset_req(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def reset_req(
+    tmcc_id: EngineId,
     hold: Annotated[bool, Query(title="refuel", description="If true, perform refuel operation")] = False,
     duration: Annotated[int | None, Query(description="Refueling time (seconds)", ge=3)] = 3,
 ) -> StatusResponse:
@@ -1437,8 +1912,8 @@ async def reset_req(
 
 
 @mobile_post(router, "/engine/{tmcc_id:int}/reset", name="Engine.Reset")
-async def reset_cmd(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def reset_cmd(
+    tmcc_id: EngineId,
     cmd: ResetCommand | None = Body(None),
 ) -> StatusResponse:
     if cmd is None:
@@ -1449,16 +1924,16 @@ async def reset_cmd(
 
 @legacy_post(router, "/engine/{tmcc_id:int}/reverse_req", name="Engine.ReverseReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/reverse", name="Engine.Reverse")
-async def reverse(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def reverse(
+    tmcc_id: EngineId,
 ) -> StatusResponse:
     return _engine.reverse(tmcc_id)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/shutdown_req", name="Engine.ShutdownReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/shutdown", name="Engine.Shutdown")
-async def eng_shutdown(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_shutdown(
+    tmcc_id: EngineId,
     dialog: bool = Query(False, description="If true, include shutdown dialog"),
 ) -> StatusResponse:
     return _engine.shutdown(tmcc_id, dialog=dialog)
@@ -1474,16 +1949,16 @@ async def eng_shutdown(
 )
 @legacy_post(router, "/engine/{tmcc_id:int}/smoke_req", name="Engine.SmokeReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/smoke", name="Engine.Smoke")
-async def smoke(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def smoke(
+    tmcc_id: EngineId,
     level: SmokeOption = Query(..., description="Set smoke output level"),
 ) -> StatusResponse:
     return _engine.smoke(tmcc_id, level=level)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/speed_req/{speed}", name="Engine.SpeedReq")
-async def eng_speed_req(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_speed_req(
+    tmcc_id: EngineId,
     speed: Annotated[
         int | str,
         Path(description="New speed (0 to 195, roll, restricted, slow, medium, limited, normal, highball)"),
@@ -1495,17 +1970,17 @@ async def eng_speed_req(
 
 
 @mobile_post(router, "/engine/{tmcc_id:int}/speed", name="Engine.Speed")
-async def eng_speed_cmd(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_speed_cmd(
+    tmcc_id: EngineId,
     cmd: SpeedCommand = Body(...),
 ) -> StatusResponse:
-    return await _engine.set_speed(tmcc_id, cmd.speed, cmd.immediate, cmd.dialog)
+    return _engine.set_speed(tmcc_id, cmd.speed, cmd.immediate, cmd.dialog)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/startup_req", name="Engine.StartupReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/startup", name="Engine.Startup")
-async def eng_startup_cmd(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_startup_cmd(
+    tmcc_id: EngineId,
     dialog: bool = Query(False, description="If true, include startup dialog"),
 ) -> StatusResponse:
     return _engine.startup(tmcc_id, dialog=dialog)
@@ -1513,39 +1988,39 @@ async def eng_startup_cmd(
 
 @legacy_post(router, "/engine/{tmcc_id:int}/stop_req", name="Engine.StopReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/stop", name="Engine.Stop")
-async def eng_stop(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_stop(
+    tmcc_id: EngineId,
 ) -> StatusResponse:
     return _engine.stop(tmcc_id)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/toggle_direction_req", name="Engine.ToggleDirectionReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/toggle_direction", name="Engine.ToggleDirection")
-async def eng_toggle_direction(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_toggle_direction(
+    tmcc_id: EngineId,
 ) -> StatusResponse:
     return _engine.toggle_direction(tmcc_id)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/volume_down_req", name="Engine.VolumeDownReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/volume_down", name="Engine.VolumeDown")
-async def eng_volume_down(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_volume_down(
+    tmcc_id: EngineId,
 ) -> StatusResponse:
     return _engine.volume_down(tmcc_id)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/volume_up_req", name="Engine.VolumeUpReq")
 @mobile_post(router, "/engine/{tmcc_id:int}/volume_up", name="Engine.VolumeUp")
-async def eng_volume_up(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_volume_up(
+    tmcc_id: EngineId,
 ) -> StatusResponse:
     return _engine.volume_up(tmcc_id)
 
 
 @legacy_post(router, "/engine/{tmcc_id:int}/{aux_req}", name="Engine.AuxReq")
-async def eng_aux_req(
-    tmcc_id: Annotated[int, Engine.id_path()],
+def eng_aux_req(
+    tmcc_id: EngineId,
     aux_req: Annotated[AuxOption, Path(description="Aux 1, Aux2, or Aux 3")],
     number: Annotated[int | None, Query(description="Number (0 - 9)", ge=0, le=9)] = None,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
@@ -1561,8 +2036,8 @@ async def eng_aux_req(
     response_model=list[RouteInfo],
     include_404=True,
 )
-async def get_routes(contains: str = None):
-    return [RouteInfo(**d) for d in get_components(CommandScope.ROUTE, contains=contains)]
+def get_routes(request: Request, contains: str = None):
+    return list_components(request, CommandScope.ROUTE, _ROUTE_LIST_ADAPTER, contains=contains)
 
 
 class Route(PyTrainComponent):
@@ -1571,6 +2046,8 @@ class Route(PyTrainComponent):
 
 
 _route = Route()
+RouteId = Annotated[int, PyTrainComponent.id_path(label="Route")]
+_ROUTE_FIRED = status_body(f"{_route.title} %d fired")
 
 
 @api_get(
@@ -1581,17 +2058,17 @@ _route = Route()
     response_model=RouteInfo,
     include_404=True,
 )
-async def get_route(tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Route")]):
-    return RouteInfo(**_route.get(tmcc_id))
+def get_route(request: Request, tmcc_id: RouteId):
+    return get_component(request, _route, tmcc_id, RouteInfo)
 
 
 @legacy_post(router, "/route/{tmcc_id:int}/fire_req", name="Route.FireReq")
 @mobile_post(router, "/route/{tmcc_id:int}/fire", name="Route.Fire")
-async def fire(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Route")],
+def fire(
+    tmcc_id: RouteId,
 ) -> StatusResponse:
     _route.do_request(TMCC1RouteCommandEnum.FIRE, tmcc_id)
-    return ok_response(f"{_route.scope.title} {tmcc_id:int} fired")
+    return status_reply(_ROUTE_FIRED % tmcc_id)
 
 
 @api_get(
@@ -1602,16 +2079,28 @@ async def fire(
     response_model=list[SwitchInfo],
     include_404=True,
 )
-async def get_switches(contains: str = None):
-    return [SwitchInfo(**d) for d in get_components(CommandScope.SWITCH, contains=contains)]
+def get_switches(request: Request, contains: str = None):
+    return list_components(request, CommandScope.SWITCH, _SWITCH_LIST_ADAPTER, contains=contains)
 
 
 class Switch(PyTrainSwitch):
     def __init__(self):
         super().__init__(CommandScope.SWITCH)
+        # encoded status for each position, with a %d hole for the switch id
+        self._thrown = {position: status_body(fmt("%d")) for position, (_, fmt) in self._throws.items()}
+
+    def throw_reply(self, tmcc_id: int, position: SwitchPosition) -> Response:
+        """
+        Throws the switch, as throw() does, but answers with the pre-encoded status
+        rather than building a StatusResponse for FastAPI to validate and serialize.
+        """
+        cmd, _ = self._throws[position]
+        self.do_request(cmd, tmcc_id)
+        return status_reply(self._thrown[position] % tmcc_id)
 
 
 _switch = Switch()
+SwitchId = Annotated[int, PyTrainComponent.id_path(label="Switch")]
 
 
 @api_get(
@@ -1622,10 +2111,11 @@ _switch = Switch()
     response_model=SwitchInfo,
     include_404=True,
 )
-async def get_switch(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Switch")],
+def get_switch(
+    request: Request,
+    tmcc_id: SwitchId,
 ) -> SwitchInfo:
-    return SwitchInfo(**_switch.get(tmcc_id))
+    return get_component(request, _switch, tmcc_id, SwitchInfo)
 
 
 @legacy_post(
@@ -1636,10 +2126,10 @@ async def get_switch(
     summary="(Deprecated) Use Switch.ThrowReq instead",
     description="Deprecated. Use Switch.ThrowReq instead.",
 )
-async def thru(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Switch")],
+def thru(
+    tmcc_id: SwitchId,
 ) -> StatusResponse:
-    return _switch.throw(tmcc_id, SwitchPosition.THRU)
+    return _switch.throw_reply(tmcc_id, SwitchPosition.THRU)
 
 
 @legacy_post(
@@ -1650,10 +2140,10 @@ async def thru(
     summary="(Deprecated) Use Switch.ThrowReq instead",
     description="Deprecated. Use Switch.ThrowReq instead.",
 )
-async def out(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Switch")],
+def out(
+    tmcc_id: SwitchId,
 ) -> StatusResponse:
-    return _switch.throw(tmcc_id, SwitchPosition.OUT)
+    return _switch.throw_reply(tmcc_id, SwitchPosition.OUT)
 
 
 @legacy_post(
@@ -1668,14 +2158,14 @@ async def out(
     name="Switch.Throw",
     summary="Throw switch thru or out",
 )
-async def throw_cmd(
-    tmcc_id: Annotated[int, PyTrainComponent.id_path(label="Switch")],
+def throw_cmd(
+    tmcc_id: SwitchId,
     position: Annotated[
         SwitchPosition,
         Query(description="New switch position"),
     ],
 ) -> StatusResponse:
-    return _switch.throw(tmcc_id, position)
+    return _switch.throw_reply(tmcc_id, position)
 
 
 @api_get(
@@ -1686,16 +2176,20 @@ async def throw_cmd(
     response_model=list[TrainInfo],
     include_404=True,
 )
-async def get_trains(contains: str = None, is_legacy: bool = None, is_tmcc: bool = None) -> list[EngineInfo]:
-    return [
-        TrainInfo(**d)
-        for d in get_components(
-            CommandScope.TRAIN,
-            is_legacy=is_legacy,
-            is_tmcc=is_tmcc,
-            contains=contains,
-        )
-    ]
+def get_trains(
+    request: Request,
+    contains: str = None,
+    is_legacy: bool = None,
+    is_tmcc: bool = None,
+) -> list[EngineInfo]:
+    return list_components(
+        request,
+        CommandScope.TRAIN,
+        _TRAIN_LIST_ADAPTER,
+        contains=contains,
+        is_legacy=is_legacy,
+        is_tmcc=is_tmcc,
+    )
 
 
 class Train(PyTrainEngine):
@@ -1715,6 +2209,7 @@ class Train(PyTrainEngine):
 
 
 _train = Train()
+TrainId = Annotated[int, Train.id_path()]
 
 
 @api_get(
@@ -1725,23 +2220,24 @@ _train = Train()
     response_model=TrainInfo,
     include_404=True,
 )
-async def get_train(
-    tmcc_id: Annotated[int, Train.id_path()],
+def get_train(
+    request: Request,
+    tmcc_id: TrainId,
 ) -> TrainInfo:
-    return TrainInfo(**_train.get(tmcc_id))
+    return get_component(request, _train, tmcc_id, TrainInfo)
 
 
 @mobile_post(router, "/train/{tmcc_id:int}/aux", name="Train.Aux")
-async def train_aux_cmd(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_aux_cmd(
+    tmcc_id: TrainId,
     cmd: AuxCommand = Body(...),
 ) -> StatusResponse:
     return _train.aux(tmcc_id, cmd.aux_req, cmd.number, cmd.duration)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/bell_req", name="Train.BellReq")
-async def train_ring_bell_req(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_ring_bell_req(
+    tmcc_id: TrainId,
     option: Annotated[
         BellOption | None,
         Query(description="Bell effect"),
@@ -1755,8 +2251,8 @@ async def train_ring_bell_req(
 
 
 @mobile_post(router, "/train/{tmcc_id:int}/bell", name="Train.Bell")
-async def train_ring_bell_cmd(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_ring_bell_cmd(
+    tmcc_id: TrainId,
     cmd: Annotated[BellCommand, Body(..., discriminator="option")],
 ) -> StatusResponse:
     option = cmd.option
@@ -1767,8 +2263,8 @@ async def train_ring_bell_cmd(
 
 @legacy_post(router, "/train/{tmcc_id:int}/boost_req", name="Train.BoostReq")
 @mobile_post(router, "/train/{tmcc_id:int}/boost", name="Train.Boost")
-async def train_boost(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_boost(
+    tmcc_id: TrainId,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
     return _train.boost(tmcc_id, duration)
@@ -1776,8 +2272,8 @@ async def train_boost(
 
 @legacy_post(router, "/train/{tmcc_id:int}/brake_req", name="Train.BrakeReq")
 @mobile_post(router, "/train/{tmcc_id:int}/brake", name="Train.Brake")
-async def train_brake(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_brake(
+    tmcc_id: TrainId,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
     return _train.brake(tmcc_id, duration)
@@ -1785,8 +2281,8 @@ async def train_brake(
 
 @legacy_post(router, "/train/{tmcc_id:int}/dialog_req", name="Train.DialogReq")
 @mobile_post(router, "/train/{tmcc_id:int}/dialog", name="Train.Dialog")
-async def train_dialog_req(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_dialog_req(
+    tmcc_id: TrainId,
     option: DialogOption = Query(..., description="Dialog effect"),
 ) -> StatusResponse:
     return _train.dialog(tmcc_id, option)
@@ -1794,23 +2290,23 @@ async def train_dialog_req(
 
 @legacy_post(router, "/train/{tmcc_id:int}/forward_req", name="Train.ForwardReq")
 @mobile_post(router, "/train/{tmcc_id:int}/forward", name="Train.Forward")
-async def train_forward(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_forward(
+    tmcc_id: TrainId,
 ) -> StatusResponse:
     return _train.forward(tmcc_id)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/front_coupler_req", name="Train.FrontCouplerReq")
 @mobile_post(router, "/train/{tmcc_id:int}/front_coupler", name="Train.FrontCoupler")
-async def train_front_coupler(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_front_coupler(
+    tmcc_id: TrainId,
 ) -> StatusResponse:
     return _train.front_coupler(tmcc_id)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/horn_req", name="Train.HornReq")
-async def train_blow_horn_req(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_blow_horn_req(
+    tmcc_id: TrainId,
     option: Annotated[HornOption, Query(description="Horn/whistle effect")],
     intensity: Annotated[
         int | None,
@@ -1822,8 +2318,8 @@ async def train_blow_horn_req(
 
 
 @mobile_post(router, "/train/{tmcc_id:int}/horn", name="Train.Horn")
-async def train_blow_horn_cmd(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_blow_horn_cmd(
+    tmcc_id: TrainId,
     cmd: Annotated[
         HornCommand,
         Body(
@@ -1846,16 +2342,16 @@ async def train_blow_horn_cmd(
 
 @legacy_post(router, "/train/{tmcc_id:int}/momentum_req", name="Train.MomentumReq")
 @mobile_post(router, "/train/{tmcc_id:int}/momentum", name="Train.Momentum")
-async def train_momentum(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_momentum(
+    tmcc_id: TrainId,
     level: Annotated[int, Query(..., description="Momentum level (0 - 7)", ge=0, le=7)],
 ) -> StatusResponse:
     return _train.momentum(tmcc_id, level)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/numeric_req", name="Train.NumericReq")
-async def train_numeric_req(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_numeric_req(
+    tmcc_id: TrainId,
     number: Annotated[int | None, Query(description="Number (0 - 9)", ge=0, le=9)] = None,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
 ) -> StatusResponse:
@@ -1863,8 +2359,8 @@ async def train_numeric_req(
 
 
 @mobile_post(router, "/train/{tmcc_id:int}/numeric", name="Train.Numeric")
-async def train_numeric_cmd(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_numeric_cmd(
+    tmcc_id: TrainId,
     cmd: Annotated[NumericCommand, Body(...)],
 ) -> StatusResponse:
     return _train.numeric(tmcc_id, cmd.number, cmd.duration)
@@ -1872,15 +2368,15 @@ async def train_numeric_cmd(
 
 @legacy_post(router, "/train/{tmcc_id:int}/rear_coupler_req", name="Train.RearCouplerReq")
 @mobile_post(router, "/train/{tmcc_id:int}/rear_coupler", name="Train.RearCoupler")
-async def train_rear_coupler(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_rear_coupler(
+    tmcc_id: TrainId,
 ) -> StatusResponse:
     return _train.rear_coupler(tmcc_id)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/reset_req", name="Train.ResetReq")
-async def train_reset_req(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_reset_req(
+    tmcc_id: TrainId,
     hold: Annotated[bool, Query(title="refuel", description="If true, perform refuel operation")] = False,
     duration: Annotated[int, Query(description="Refueling time (seconds)", ge=3)] = 3,
 ) -> StatusResponse:
@@ -1889,8 +2385,8 @@ async def train_reset_req(
 
 
 @mobile_post(router, "/train/{tmcc_id:int}/reset", name="Train.Reset")
-async def train_reset_cmd(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_reset_cmd(
+    tmcc_id: TrainId,
     cmd: ResetCommand | None = Body(None),
 ) -> StatusResponse:
     # Apply defaults if body omitted
@@ -1902,16 +2398,16 @@ async def train_reset_cmd(
 
 @legacy_post(router, "/train/{tmcc_id:int}/reverse_req", name="Train.ReverseReq")
 @mobile_post(router, "/train/{tmcc_id:int}/reverse", name="Train.Reverse")
-async def train_reverse(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_reverse(
+    tmcc_id: TrainId,
 ) -> StatusResponse:
     return _train.reverse(tmcc_id)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/shutdown_req", name="Train.ShutdownReq")
 @mobile_post(router, "/train/{tmcc_id:int}/shutdown", name="Train.Shutdown")
-async def train_shutdown(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_shutdown(
+    tmcc_id: TrainId,
     dialog: bool = False,
 ) -> StatusResponse:
     return _train.shutdown(tmcc_id, dialog=dialog)
@@ -1927,16 +2423,16 @@ async def train_shutdown(
 )
 @legacy_post(router, "/train/{tmcc_id:int}/smoke_req", name="Train.SmokeReq")
 @mobile_post(router, "/train/{tmcc_id:int}/smoke", name="Train.Smoke")
-async def train_smoke(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_smoke(
+    tmcc_id: TrainId,
     level: SmokeOption = Query(..., description="Set smoke output level"),
 ) -> StatusResponse:
     return _train.smoke(tmcc_id, level=level)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/speed_req/{speed}", name="Train.SpeedReq")
-async def train_speed_req(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_speed_req(
+    tmcc_id: TrainId,
     speed: Annotated[
         int | str,
         Path(description="New speed (0 to 195, roll, restricted, slow, medium, limited, normal, highball)"),
@@ -1948,8 +2444,8 @@ async def train_speed_req(
 
 
 @mobile_post(router, "/train/{tmcc_id:int}/speed", name="Train.Speed")
-async def train_speed_cmd(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_speed_cmd(
+    tmcc_id: TrainId,
     cmd: SpeedCommand = Body(...),
 ) -> StatusResponse:
     return train_speed_req(tmcc_id, cmd.speed, immediate=cmd.immediate, dialog=cmd.dialog)
@@ -1957,8 +2453,8 @@ async def train_speed_cmd(
 
 @legacy_post(router, "/train/{tmcc_id:int}/startup_req", name="Train.StartupReq")
 @mobile_post(router, "/train/{tmcc_id:int}/startup", name="Train.Startup")
-async def train_startup(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_startup(
+    tmcc_id: TrainId,
     dialog: bool = False,
 ) -> StatusResponse:
     return _train.startup(tmcc_id, dialog=dialog)
@@ -1966,39 +2462,39 @@ async def train_startup(
 
 @legacy_post(router, "/train/{tmcc_id:int}/stop_req", name="Train.StopReq")
 @mobile_post(router, "/train/{tmcc_id:int}/stop", name="Train.Stop")
-async def train_stop(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_stop(
+    tmcc_id: TrainId,
 ) -> StatusResponse:
     return _train.stop(tmcc_id)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/toggle_direction_req", name="Train.ToggleDirectionReq")
 @mobile_post(router, "/train/{tmcc_id:int}/toggle_direction", name="Train.ToggleDirection")
-async def train_toggle_direction(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_toggle_direction(
+    tmcc_id: TrainId,
 ) -> StatusResponse:
     return _train.toggle_direction(tmcc_id)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/volume_down_req", name="Train.VolumeDownReq")
 @mobile_post(router, "/train/{tmcc_id:int}/volume_down", name="Train.VolumeDown")
-async def train_volume_down(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_volume_down(
+    tmcc_id: TrainId,
 ) -> StatusResponse:
     return _train.volume_down(tmcc_id)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/volume_up_req", name="Train.VolumeUpReq")
 @mobile_post(router, "/train/{tmcc_id:int}/volume_up", name="Train.VolumeUp")
-async def train_volume_up(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_volume_up(
+    tmcc_id: TrainId,
 ) -> StatusResponse:
     return _train.volume_up(tmcc_id)
 
 
 @legacy_post(router, "/train/{tmcc_id:int}/{aux_req}", name="Train.AuxReq")
-async def train_aux_req(
-    tmcc_id: Annotated[int, Train.id_path()],
+def train_aux_req(
+    tmcc_id: TrainId,
     aux_req: Annotated[AuxOption, Path(description="Aux 1, Aux2, or Aux 3")],
     number: Annotated[int | None, Query(description="Number (0 - 9)", ge=0, le=9)] = None,
     duration: Annotated[float | None, Query(description="Duration (seconds)", gt=0.0)] = None,
@@ -2006,4 +2502,43 @@ async def train_aux_req(
     return _train.aux(tmcc_id, aux_req, number, duration)
 
 
+# the component and model that answer a batch entry for each scope
+_BATCH_LOOKUP: dict[Component, tuple[PyTrainComponent, type[ComponentInfo]]] = {
+    Component.ACCESSORY: (_accessory, AccessoryInfo),
+    Component.BLOCK: (_block, BlockInfo),
+    Component.ENGINE: (_engine, EngineInfo),
+    Component.ROUTE: (_route, RouteInfo),
+    Component.SWITCH: (_switch, SwitchInfo),
+    Component.TRAIN: (_train, TrainInfo),
+}
+_BATCH_MAX = 256
+
+
+@mobile_post(
+    router,
+    "/components",
+    name="Components.Batch",
+    summary="Get the state of several components",
+    description="Returns the state of each requested component, in request order; "
+    "components that do not exist are returned as null.",
+    response_model=list[AccessoryInfo | BlockInfo | EngineInfo | RouteInfo | SwitchInfo | TrainInfo | None],
+    # document the 200 through response_model alone; repeating the union as a response model duplicates it
+    responses={200: {"description": "Success"}},
+)
+def get_component_batch(
+    refs: Annotated[list[ComponentRef], Body(min_length=1, max_length=_BATCH_MAX)],
+) -> Response:
+    bodies = []
+    for ref in refs:
+        component, model = _BATCH_LOOKUP[ref.scope]
+        try:
+            body, _ = component_body(component, ref.tmcc_id, model)
+        except HTTPException as e:
+            if e.status_code != status.HTTP_404_NOT_FOUND:
+                raise
+            body = b"null"
+        bodies.append(body)
+    return Response(content=b"[" + b",".join(bodies) + b"]", media_type="application/json")
+
+
 app.include_router(router)
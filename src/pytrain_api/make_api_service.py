@@ -11,19 +11,38 @@ import ipaddress
 import os
 import platform
 import pwd
-import shutil
+import re
+import shlex
 import subprocess
 import sys
-import tempfile
 from argparse import ArgumentParser
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
 from pytrain import is_linux
 from pytrain.utils.path_utils import find_dir, find_file
 
-from . import get_version, is_package
-from .pytrain_api import API_NAME
+from . import API_NAME, get_version, is_package
+
+# a dotted quad with no leading zeros, the only IPv4 form ipaddress.ip_address accepts
+_OCTET = r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+_IPV4 = re.compile(rf"{_OCTET}(?:\.{_OCTET}){{3}}")
+
+# exit status of the install script when every step succeeded but the service didn't start
+_START_FAILED = 3
+
+
+@lru_cache(maxsize=1)
+def _local_users() -> frozenset[str]:
+    """
+    Names of the accounts in /etc/passwd, read once and without going through NSS.
+    """
+    try:
+        with open("/etc/passwd", "r") as f:
+            return frozenset(line.split(":", 1)[0] for line in f if line.strip() and not line.startswith("#"))
+    except OSError:
+        return frozenset()
 
 
 class MakeApiService:
@@ -125,17 +144,16 @@ class MakeApiService:
         if template is None:
             print("\nUnable to locate shell script template. Exiting")
             return None
-        with open(template, "r") as f:
-            template_data = f.read()
-            for key, value in self.config.items():
-                template_data = template_data.replace(key, value)
+        template_data = self.fill_template(Path(template).read_bytes())
         # write the shell script file
         path = Path(self._home, "pytrain_api.bash")
+        tmp = path.with_suffix(".new")
+        tmp.write_bytes(template_data)
+        os.chmod(tmp, 0o755)
+        # the previous script is renamed, not copied, to its backup, and the new one swapped into place
         if path.exists():
-            shutil.copy2(path, path.with_suffix(".bak"))
-        with open(path, "w") as f:
-            f.write(template_data)
-        os.chmod(path, 0o755)
+            os.replace(path, path.with_suffix(".bak"))
+        os.replace(tmp, path)
         print(f"\n{path} created")
         return path
 
@@ -147,57 +165,37 @@ class MakeApiService:
         if template is None:
             print("\nUnable to locate service definition template. Exiting")
             return None
-        with open(template, "r") as f:
-            template_data = f.read()
-            for key, value in self.config.items():
-                template_data = template_data.replace(key, value)
-        tmp = tempfile.NamedTemporaryFile()
-        with open(tmp.name, "w") as f:
-            f.write(template_data)
+        template_data = self.fill_template(Path(template).read_bytes())
         service = "pytrain_api.service"
-        result = subprocess.run(
-            f"sudo cp -f {tmp.name} /etc/systemd/system/{service}".split(),
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            print(f"Error creating /etc/systemd/system/{service}: {result.stderr} Exiting")
-            return None
-        result = subprocess.run(
-            f"sudo chmod 644 /etc/systemd/system/{service}".split(),
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            print(f"Error changing mode of /etc/systemd/system/{service}: {result.stderr} Exiting")
-            return None
-        result = subprocess.run(
-            "sudo systemctl daemon-reload".split(),
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            print(f"Error reloading system daemons: {result.stderr} Exiting")
-            return None
-        result = subprocess.run(
-            f"sudo systemctl enable {service}".split(),
-            capture_output=True,
-            text=True,
-        )
+        unit = f"/etc/systemd/system/{service}"
+        # run every privileged step in one sudo shell, which reads the unit file from stdin;
+        # the first step to fail names itself on stderr
+        steps = [
+            (f"cat > {unit}", f"Error creating {unit}"),
+            (f"chmod 644 {unit}", f"Error changing mode of {unit}"),
+            ("systemctl daemon-reload", "Error reloading system daemons"),
+            (f"systemctl enable {service}", f"Error enabling {API_NAME} service"),
+        ]
+        script = "\n".join(f"{cmd} || {{ echo {shlex.quote(msg)} >&2; exit 1; }}" for cmd, msg in steps)
+        if self._start_service:
+            # the service is installed by now, so failing to start it doesn't undo the install
+            script += f"\nsystemctl restart {service} || exit {_START_FAILED}"
+        result = subprocess.run(["sudo", "sh", "-c", script], input=template_data, capture_output=True)
+        if self._start_service and result.returncode == _START_FAILED:
+            print(
+                f"\nWarning: {API_NAME} service installed, but it failed to start; check 'systemctl status {service}'"
+            )
+            return service
         if result.returncode != 0:
-            print(f"Error enabling {API_NAME} service: {result.stderr} Exiting")
+            print(f"{result.stderr.decode(errors='replace').strip()} Exiting")
             return None
         if self._start_service:
-            subprocess.run(
-                f"sudo systemctl restart {service}".split(),
-            )
             print(f"\n{API_NAME} service started...")
         return service
 
     @staticmethod
     def is_service_present(service: str) -> bool:
-        cmd = f"sudo systemctl status {service}.service"
-        result = subprocess.run(cmd.split(), capture_output=True)
+        result = subprocess.run(["sudo", "systemctl", "status", f"{service}.service"], capture_output=True)
         if result.returncode == 4 or os.path.exists(f"/etc/systemd/system/{service}.service") is False:
             return False
         else:
@@ -205,11 +203,15 @@ class MakeApiService:
 
     @staticmethod
     def deactivate_service(service: str) -> None:
-        subprocess.run(f"sudo systemctl stop {service}.service".split())
-        subprocess.run(f"sudo systemctl disable {service}.service".split())
-        subprocess.run(f"sudo rm -fr /etc/systemd/system/{service}.service".split())
-        subprocess.run("sudo systemctl daemon-reload".split())
-        subprocess.run("sudo systemctl reset-failed".split())
+        # every step runs regardless of the ones before it, all under a single sudo
+        steps = (
+            f"systemctl stop {service}.service",
+            f"systemctl disable {service}.service",
+            f"rm -fr /etc/systemd/system/{service}.service",
+            "systemctl daemon-reload",
+            "systemctl reset-failed",
+        )
+        subprocess.run(["sudo", "sh", "-c", "; ".join(steps)])
 
     def deactivate_and_remove_services(self):
         if platform.system().lower() != "linux":
@@ -239,6 +241,15 @@ class MakeApiService:
     def config(self) -> Dict[str, str]:
         return self._config
 
+    def fill_template(self, template_data: bytes) -> bytes:
+        """
+        Replaces every ___PLACEHOLDER___ from the config in one pass over the raw template bytes.
+        """
+        values = {key.encode(): value.encode() for key, value in self.config.items()}
+        keys = sorted(values, key=len, reverse=True)
+        pattern = re.compile(b"|".join(re.escape(key) for key in keys))
+        return pattern.sub(lambda m: values[m.group(0)], template_data)
+
     @property
     def pytrain_path(self) -> str:
         return f"{self._cwd}/{self._exe}"
@@ -283,6 +294,8 @@ class MakeApiService:
 
     @staticmethod
     def is_valid_ip(ip: str) -> bool:
+        if _IPV4.fullmatch(ip):
+            return True
         try:
             ipaddress.ip_address(ip)
             return True
@@ -355,6 +368,9 @@ class MakeApiService:
 
     @staticmethod
     def validate_username(user: str) -> bool:
+        if user in _local_users():
+            return True
+        # not a local account; it may still come from a directory service (LDAP, SSSD, etc.)
         try:
             pwd.getpwnam(user)
             return True
@@ -27,12 +27,11 @@ from pytrain.utils.argument_parser import PyTrainArgumentParser
 from pytrain.utils.ip_tools import get_ip_address
 from zeroconf import ServiceInfo, Zeroconf
 
-from . import is_package
+from . import API_NAME, is_package
 
 
 log = logging.getLogger(__name__)
 
-API_NAME = "PyTrain Api"
 API_NAME_SHORT = API_NAME.replace(" ", "")
 API_PACKAGE = "pytrain-ogr-api"
 SERVICE_TYPE = f"_{API_NAME_SHORT.lower()}._tcp.local."
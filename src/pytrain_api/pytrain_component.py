@@ -10,6 +10,7 @@
 from __future__ import annotations
 
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Callable, TypeVar
 
 from fastapi import HTTPException, Path
@@ -60,6 +61,18 @@ LEGACY_RR_SPEED_MAP = {
     206: TMCC2RRSpeedsEnum.NORMAL,
     207: TMCC2RRSpeedsEnum.HIGHBALL,
 }
+# speed steps for the railroad speeds 201..207, indexed by speed - 201
+TMCC_RR_SPEED_STEPS = tuple(TMCC_RR_SPEED_MAP[speed].value[0] for speed in range(201, 208))
+LEGACY_RR_SPEED_STEPS = tuple(LEGACY_RR_SPEED_MAP[speed].value[0] for speed in range(201, 208))
+
+
+def _speeds_by_name(enum: type[CommandDefEnum]) -> dict[str, CommandDefEnum]:
+    return {name.removeprefix("SPEED_"): enum[name] for name in enum.__members__ if name.startswith("SPEED_")}
+
+
+# named speed commands ("roll", "highball", ...), keyed by the upper-cased name after "SPEED_"
+TMCC1_SPEED_BY_NAME = _speeds_by_name(TMCC1EngineCommandEnum)
+TMCC2_SPEED_BY_NAME = _speeds_by_name(TMCC2EngineCommandEnum)
 
 TMCC1_MOMENTUM_MAP = RangeKeyDict(
     {
@@ -116,6 +129,16 @@ class AuxOption(str, Enum):
     AUX3 = "aux3"
 
 
+def _aux_map(enum: type[CommandDefEnum], suffix: str) -> dict[AuxOption, CommandDefEnum]:
+    cmds = {aux: enum.by_name(f"{aux.name}_{suffix}") for aux in AuxOption}
+    return {aux: cmd for aux, cmd in cmds.items() if cmd is not None}
+
+
+ACC_AUX_MAP = _aux_map(TMCC1AuxCommandEnum, "OPT_ONE")
+TMCC1_AUX_MAP = _aux_map(TMCC1EngineCommandEnum, "OPTION_ONE")
+TMCC2_AUX_MAP = _aux_map(TMCC2EngineCommandEnum, "OPTION_ONE")
+
+
 class BellOption(str, Enum):
     DING = "ding"
     OFF = "off"
@@ -152,11 +175,58 @@ class SmokeOption(str, Enum):
     HIGH = "high"
 
 
+TMCC2_BELL_MAP = {
+    None: TMCC2EngineCommandEnum.RING_BELL,
+    BellOption.TOGGLE: TMCC2EngineCommandEnum.RING_BELL,
+    BellOption.ON: TMCC2EngineCommandEnum.BELL_ON,
+    BellOption.OFF: TMCC2EngineCommandEnum.BELL_OFF,
+}
+
+TMCC2_SMOKE_MAP = {
+    None: TMCC2EffectsControl.SMOKE_OFF,
+    SmokeOption.OFF: TMCC2EffectsControl.SMOKE_OFF,
+    SmokeOption.ON: TMCC2EffectsControl.SMOKE_LOW,
+    SmokeOption.LOW: TMCC2EffectsControl.SMOKE_LOW,
+    SmokeOption.MEDIUM: TMCC2EffectsControl.SMOKE_MEDIUM,
+    SmokeOption.HIGH: TMCC2EffectsControl.SMOKE_HIGH,
+}
+
+
 class SwitchPosition(str, Enum):
     THRU = "thru"
     OUT = "out"
 
 
+SWITCH_COMMANDS = {
+    SwitchPosition.THRU: TMCC1SwitchCommandEnum.THRU,
+    SwitchPosition.OUT: TMCC1SwitchCommandEnum.OUT,
+}
+
+
+ENGINE_COMMANDS = {True: TMCC1EngineCommandEnum, False: TMCC2EngineCommandEnum}
+
+NUMERIC_COMMANDS = frozenset(
+    (TMCC1EngineCommandEnum.NUMERIC, TMCC2EngineCommandEnum.NUMERIC, TMCC1AuxCommandEnum.NUMERIC)
+)
+
+# CommandReq.send() does not mutate the request, so identical plain requests can be
+# built once and re-sent. Sequence requests carry per-send state and are always built fresh.
+_REQ_POOL: dict[tuple, CommandReq] = {}
+_REQ_POOL_MAX = 4096
+
+
+def pooled_request(cmd_def: E, tmcc_id: int = None, data: int = None, scope: CommandScope = None) -> CommandReq:
+    key = (cmd_def, tmcc_id, data, scope)
+    req = _REQ_POOL.get(key)
+    if req is None:
+        req = CommandReq.build(cmd_def, tmcc_id, data, scope)
+        if type(req) is CommandReq:
+            if len(_REQ_POOL) >= _REQ_POOL_MAX:
+                _REQ_POOL.clear()
+            _REQ_POOL[key] = req
+    return req
+
+
 class PyTrainComponent:
     """
     Represents a component of the PyTrain system as exchanged via the API.
@@ -169,6 +239,7 @@ class PyTrainComponent:
 
     # noinspection PyTypeHints
     @classmethod
+    @lru_cache(maxsize=None)
     def id_path(cls, label: str = None, min_val: int = 1, max_val: int = 99) -> Path:
         label = label if label else cls.__name__.replace("PyTrain", "")
         return Path(
@@ -181,7 +252,10 @@ class PyTrainComponent:
     def __init__(self, scope: CommandScope):
         super().__init__()
         self._scope = scope
+        self._title = scope.title
         self._state_store = None
+        self._boost_prefix = f"Sending Boost request to {self._title} "
+        self._brake_prefix = f"Sending Brake request to {self._title} "
 
     @property
     def state_store(self) -> ComponentStateStore:
@@ -193,20 +267,35 @@ class PyTrainComponent:
     def scope(self) -> CommandScope:
         return self._scope
 
-    def get(self, tmcc_id: int) -> dict[str, Any]:
+    @property
+    def title(self) -> str:
+        """
+        The scope's display title ("Engine", "Accessory", ...), resolved once rather than per reply.
+        """
+        return self._title
+
+    def state(self, tmcc_id: int) -> ComponentState:
         state: ComponentState = self.state_store.query(self.scope, tmcc_id)
         if state is None:
             headers = {"X-Error": "404"}
-            raise HTTPException(status_code=404, headers=headers, detail=f"{self.scope.title} {tmcc_id} not found")
-        else:
-            return state.as_dict()
+            raise HTTPException(status_code=404, headers=headers, detail=f"{self.title} {tmcc_id} not found")
+        return state
+
+    def get(self, tmcc_id: int) -> dict[str, Any]:
+        return self.state(tmcc_id).as_dict()
 
     def do_numeric(self, cmd: CommandDefEnum, tmcc_id, number, duration) -> StatusResponse:
-        if cmd not in [TMCC1EngineCommandEnum.NUMERIC, TMCC2EngineCommandEnum.NUMERIC, TMCC1AuxCommandEnum.NUMERIC]:
+        if cmd not in NUMERIC_COMMANDS:
             raise HTTPException(status_code=400, detail=f"Invalid command '{cmd}' for numeric request")
         self.do_request(cmd, tmcc_id, data=number, duration=duration)
         d = f" for {duration} second(s)" if duration else ""
-        return ok_response(f"Sending Numeric {number} to {self.scope.title} {tmcc_id}{d}")
+        return ok_response(f"Sending Numeric {number} to {self.title} {tmcc_id}{d}")
+
+    @staticmethod
+    def timed_response(prefix: str, tmcc_id: int, duration: float = None) -> StatusResponse:
+        if duration:
+            return ok_response(f"{prefix}{tmcc_id} for {duration} second(s)")
+        return ok_response(prefix + str(tmcc_id))
 
     def do_relative_speed(
         self,
@@ -217,12 +306,13 @@ class PyTrainComponent:
     ) -> StatusResponse:
         self.do_request(cmd, tmcc_id, data=speed, duration=duration)
         d = f" for {duration} second(s)" if duration else ""
-        return ok_response(f"Sending Relative Speed {speed} request to {self.scope.title} {tmcc_id}{d}")
+        return ok_response(f"Sending Relative Speed {speed} request to {self.title} {tmcc_id}{d}")
 
     def send(self, request: E, tmcc_id: int, data: int = None) -> StatusResponse:
         try:
-            req = CommandReq(request, tmcc_id, data, self.scope).send()
-            return ok_response(f"{self.scope.title} {req} sent")
+            req = pooled_request(request, tmcc_id, data, self.scope)
+            req.send()
+            return ok_response(f"{self.title} {req} sent")
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
@@ -242,7 +332,7 @@ class PyTrainComponent:
                 cmd_req = cmd_def
             else:
                 scope = scope or self.scope
-                cmd_req = CommandReq.build(cmd_def, tmcc_id, data, scope)
+                cmd_req = pooled_request(cmd_def, tmcc_id, data, scope)
             if submit:
                 repeat = repeat if repeat and repeat >= 1 else 1
                 duration = duration if duration is not None else 0
@@ -264,7 +354,7 @@ class PyTrainAccessory(PyTrainComponent):
             raise HTTPException(status_code=404, headers=headers, detail=f"{label} {tmcc_id} not found")
         if not is_valid(acc_state):
             ia = "an" if label.startswith("A") else "a"
-            raise HTTPException(status_code=422, detail=f"{self.scope.title} {tmcc_id} is not {ia} {label}")
+            raise HTTPException(status_code=422, detail=f"{self.title} {tmcc_id} is not {ia} {label}")
 
     def amc2_motor(
         self,
@@ -349,23 +439,21 @@ class PyTrainAccessory(PyTrainComponent):
         self.do_request(coupler, tmcc_id, duration=duration)
         d = f" for {duration} second(s)" if duration else ""
         ct = coupler.title.replace("_", " ")
-        return ok_response(f"Sending open {ct} request to {self.scope.title} {tmcc_id}{d}")
+        return ok_response(f"Sending open {ct} request to {self.title} {tmcc_id}{d}")
 
     def boost(self, tmcc_id: int, duration: float = None) -> StatusResponse:
         self.do_request(TMCC1AuxCommandEnum.BOOST, tmcc_id, duration=duration)
-        d = f" for {duration} second(s)" if duration else ""
-        return ok_response(f"Sending Boost request to {self.scope.title} {tmcc_id}{d}")
+        return self.timed_response(self._boost_prefix, tmcc_id, duration)
 
     def brake(self, tmcc_id: int, duration: float = None) -> StatusResponse:
         self.do_request(TMCC1AuxCommandEnum.BRAKE, tmcc_id, duration=duration)
-        d = f" for {duration} second(s)" if duration else ""
-        return ok_response(f"Sending Brake request to {self.scope.title} {tmcc_id}{d}")
+        return self.timed_response(self._brake_prefix, tmcc_id, duration)
 
     def relative_speed(self, tmcc_id: int, speed: int, duration: float = None) -> StatusResponse:
         return self.do_relative_speed(TMCC1AuxCommandEnum.RELATIVE_SPEED, tmcc_id, speed, duration)
 
     def aux(self, tmcc_id: int, aux_req: AuxOption, number: int = None, duration: float = None) -> StatusResponse:
-        cmd = TMCC1AuxCommandEnum.by_name(f"{aux_req.name}_OPT_ONE")
+        cmd = ACC_AUX_MAP.get(aux_req)
         if cmd:
             if number is not None:
                 self.do_request(cmd, tmcc_id)
@@ -373,21 +461,26 @@ class PyTrainAccessory(PyTrainComponent):
             else:
                 self.do_request(cmd, tmcc_id, duration=duration)
             d = f" for {duration} second(s)" if duration else ""
-            return ok_response(f"Sending {aux_req.name} to {self.scope.title} {tmcc_id}{d}")
+            return ok_response(f"Sending {aux_req.name} to {self.title} {tmcc_id}{d}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Aux option '{aux_req.value}' not supported on {self.scope.title} {tmcc_id}",
+            detail=f"Aux option '{aux_req.value}' not supported on {self.title} {tmcc_id}",
         )
 
 
 class PyTrainSwitch(PyTrainComponent):
     def __init__(self, scope: CommandScope):
         super().__init__(scope=scope)
+        # (command, status format) for each position, so a throw only fills in the id
+        self._throws = {
+            position: (SWITCH_COMMANDS[position], f"Throwing {self.title} {{}} {position.value}".format)
+            for position in SwitchPosition
+        }
 
     def throw(self, tmcc_id: int, position: SwitchPosition) -> StatusResponse:
-        pos = TMCC1SwitchCommandEnum.OUT if position == SwitchPosition.OUT else TMCC1SwitchCommandEnum.THRU
-        self.do_request(pos, tmcc_id)
-        return ok_response(f"Throwing {self.scope.title} {tmcc_id} {position.value}")
+        cmd, status_format = self._throws[position]
+        self.do_request(cmd, tmcc_id)
+        return ok_response(status_format(tmcc_id))
 
 
 class PyTrainEngine(PyTrainComponent):
@@ -407,7 +500,14 @@ class PyTrainEngine(PyTrainComponent):
     def tmcc(self, tmcc_id: int) -> str:
         return " -tmcc" if self.is_tmcc(tmcc_id) else ""
 
-    async def set_speed(
+    def commands(self, tmcc_id: int) -> type[TMCC1EngineCommandEnum] | type[TMCC2EngineCommandEnum]:
+        """
+        The engine command set for the protocol this engine/train speaks; both enums share
+        member names for the commands common to TMCC and Legacy.
+        """
+        return ENGINE_COMMANDS[self.is_tmcc(tmcc_id)]
+
+    def set_speed(
         self,
         tmcc_id: int,
         speed: int | str,
@@ -423,9 +523,9 @@ class PyTrainEngine(PyTrainComponent):
                 speed = int(speed)
         except ValueError:
             pass
-        tmcc = self.tmcc(tmcc_id)
+        tmcc = self.is_tmcc(tmcc_id)
         if immediate:
-            cmd_def = TMCC1EngineCommandEnum.ABSOLUTE_SPEED if tmcc is True else TMCC2EngineCommandEnum.ABSOLUTE_SPEED
+            cmd_def = TMCC1EngineCommandEnum.ABSOLUTE_SPEED if tmcc else TMCC2EngineCommandEnum.ABSOLUTE_SPEED
         elif dialog:
             cmd_def = SequenceCommandEnum.RAMPED_SPEED_DIALOG_SEQ
         else:
@@ -433,43 +533,43 @@ class PyTrainEngine(PyTrainComponent):
         cmd = None
         if tmcc:
             if isinstance(speed, int):
-                if speed in TMCC_RR_SPEED_MAP:
-                    speed = TMCC_RR_SPEED_MAP[speed].value[0]
+                if 201 <= speed <= 207:
+                    speed = TMCC_RR_SPEED_STEPS[speed - 201]
                     cmd = CommandReq.build(cmd_def, tmcc_id, data=speed, scope=self.scope)
                 elif 0 <= speed <= 31:
                     cmd = CommandReq.build(cmd_def, tmcc_id, data=speed, scope=self.scope)
             elif isinstance(speed, str):
-                cmd_def = TMCC1EngineCommandEnum.by_name(f"SPEED_{speed.upper()}", False)
+                cmd_def = TMCC1_SPEED_BY_NAME.get(speed.rstrip().upper())
                 if cmd_def:
                     cmd = CommandReq.build(cmd_def, tmcc_id, scope=self.scope)
             if cmd is None:
-                sc = self.scope.title
+                sc = self.title
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"TMCC {sc} speeds must be between 0 and 31 inclusive: speed step {speed} is invalid.",
                 )
         else:
             if isinstance(speed, int):
-                if speed in LEGACY_RR_SPEED_MAP:
-                    speed = LEGACY_RR_SPEED_MAP[speed].value[0]
+                if 201 <= speed <= 207:
+                    speed = LEGACY_RR_SPEED_STEPS[speed - 201]
                     cmd = CommandReq.build(cmd_def, tmcc_id, data=speed, scope=self.scope)
                 elif 0 <= speed <= 199:
                     cmd = CommandReq.build(cmd_def, tmcc_id, data=speed, scope=self.scope)
             elif isinstance(speed, str):
-                cmd_def = TMCC2EngineCommandEnum.by_name(f"SPEED_{speed.upper()}", False)
+                cmd_def = TMCC2_SPEED_BY_NAME.get(speed.rstrip().upper())
                 if cmd_def:
                     cmd = CommandReq.build(cmd_def, tmcc_id, scope=self.scope)
             if cmd is None:
-                sc = self.scope.title
+                sc = self.title
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"TMCC {sc} speeds must be between 0 and 31 inclusive: speed step {speed} is invalid.",
                 )
         self.do_request(cmd)
-        return ok_response("{self.scope.title} {tmcc_id} speed now: {speed}")
+        return ok_response(f"{self.title} {tmcc_id} speed now: {speed}")
 
     def relative_speed(self, tmcc_id: int, speed: int, duration: float = None) -> StatusResponse:
-        cmd = TMCC1EngineCommandEnum.RELATIVE_SPEED if self.is_tmcc(tmcc_id) else TMCC2EngineCommandEnum.RELATIVE_SPEED
+        cmd = self.commands(tmcc_id).RELATIVE_SPEED
         return self.do_relative_speed(cmd, tmcc_id, speed, duration)
 
     def dialog(self, tmcc_id: int, dialog: DialogOption) -> StatusResponse:
@@ -479,53 +579,44 @@ class PyTrainEngine(PyTrainComponent):
             cmd = Tmcc2DialogToCommand.get(dialog, None)
         if cmd:
             self.do_request(cmd, tmcc_id)
-            return ok_response(f"Issued dialog request '{dialog.value}' to {self.scope.title} {tmcc_id}")
+            return ok_response(f"Issued dialog request '{dialog.value}' to {self.title} {tmcc_id}")
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Dialog option '{dialog.value}' not supported on {self.scope.title} {tmcc_id}",
+                detail=f"Dialog option '{dialog.value}' not supported on {self.title} {tmcc_id}",
             )
 
     def startup(self, tmcc_id: int, dialog: bool = False) -> StatusResponse:
-        if self.tmcc(tmcc_id):
+        if self.is_tmcc(tmcc_id):
             cmd = TMCC1EngineCommandEnum.START_UP_IMMEDIATE
         else:
             cmd = (
                 TMCC2EngineCommandEnum.START_UP_DELAYED if dialog is True else TMCC2EngineCommandEnum.START_UP_IMMEDIATE
             )
         self.do_request(cmd, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} starting up...")
+        return ok_response(f"{self.title} {tmcc_id} starting up...")
 
     def shutdown(self, tmcc_id: int, dialog: bool = False) -> StatusResponse:
-        if self.tmcc(tmcc_id):
+        if self.is_tmcc(tmcc_id):
             cmd = TMCC1EngineCommandEnum.SHUTDOWN_IMMEDIATE
         else:
             cmd = (
                 TMCC2EngineCommandEnum.SHUTDOWN_DELAYED if dialog is True else TMCC2EngineCommandEnum.SHUTDOWN_IMMEDIATE
             )
         self.do_request(cmd, tmcc_id)
-        return ok_response("{self.scope.title} {tmcc_id} shutting down...")
+        return ok_response(f"{self.title} {tmcc_id} shutting down...")
 
     def stop(self, tmcc_id: int) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.STOP_IMMEDIATE, tmcc_id)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.STOP_IMMEDIATE, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} stopping...")
+        self.do_request(self.commands(tmcc_id).STOP_IMMEDIATE, tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} stopping...")
 
     def forward(self, tmcc_id: int) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.FORWARD_DIRECTION, tmcc_id)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.FORWARD_DIRECTION, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} forward...")
+        self.do_request(self.commands(tmcc_id).FORWARD_DIRECTION, tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} forward...")
 
     def front_coupler(self, tmcc_id: int) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.FRONT_COUPLER, tmcc_id)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.FRONT_COUPLER, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} front coupler...")
+        self.do_request(self.commands(tmcc_id).FRONT_COUPLER, tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} front coupler...")
 
     def momentum(self, tmcc_id: int, level: int) -> StatusResponse:
         if self.is_tmcc(tmcc_id):
@@ -533,51 +624,37 @@ class PyTrainEngine(PyTrainComponent):
             self.do_request(cmd, tmcc_id)
         else:
             self.do_request(TMCC2EngineCommandEnum.MOMENTUM, tmcc_id, data=level)
-        return ok_response(f"{self.scope.title} {tmcc_id} momentum to {level}...")
+        return ok_response(f"{self.title} {tmcc_id} momentum to {level}...")
 
     def rear_coupler(self, tmcc_id: int) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.REAR_COUPLER, tmcc_id)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.REAR_COUPLER, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} rear coupler...")
+        self.do_request(self.commands(tmcc_id).REAR_COUPLER, tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} rear coupler...")
 
     def reset(
         self,
         tmcc_id: int,
         duration: int = None,
     ) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.RESET, tmcc_id, duration=duration)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.RESET, tmcc_id, duration=duration)
-        return ok_response(f"{self.scope.title} {tmcc_id} {'reset and refueled' if duration else 'reset'}...")
+        self.do_request(self.commands(tmcc_id).RESET, tmcc_id, duration=duration)
+        return ok_response(f"{self.title} {tmcc_id} {'reset and refueled' if duration else 'reset'}...")
 
     def reverse(self, tmcc_id: int) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.REVERSE_DIRECTION, tmcc_id)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.REVERSE_DIRECTION, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} reverse...")
+        self.do_request(self.commands(tmcc_id).REVERSE_DIRECTION, tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} reverse...")
 
     def ring_bell(
         self, tmcc_id: int, option: BellOption | None, duration: float = None, ding: int = 0
     ) -> StatusResponse:
         if self.is_tmcc(tmcc_id):
             self.do_request(TMCC1EngineCommandEnum.RING_BELL, tmcc_id)
-        else:
-            if option is None or option == BellOption.TOGGLE:
-                self.do_request(TMCC2EngineCommandEnum.RING_BELL, tmcc_id)
-            elif option == BellOption.ON:
-                self.do_request(TMCC2EngineCommandEnum.BELL_ON, tmcc_id)
-            elif option == BellOption.OFF:
-                self.do_request(TMCC2EngineCommandEnum.BELL_OFF, tmcc_id)
-            elif option == BellOption.ONCE:
-                self.do_request(TMCC2EngineCommandEnum.BELL_ONE_SHOT_DING, tmcc_id, 0, duration=duration)
-            elif option == BellOption.DING:
-                ding = ding if ding is not None and 0 <= ding <= 3 else 0
-                self.do_request(TMCC2EngineCommandEnum.BELL_ONE_SHOT_DING, tmcc_id, ding)
-        return ok_response(f"{self.scope.title} {tmcc_id} ringing bell...")
+        elif option in TMCC2_BELL_MAP:
+            self.do_request(TMCC2_BELL_MAP[option], tmcc_id)
+        elif option == BellOption.ONCE:
+            self.do_request(TMCC2EngineCommandEnum.BELL_ONE_SHOT_DING, tmcc_id, 0, duration=duration)
+        elif option == BellOption.DING:
+            ding = ding if ding is not None and 0 <= ding <= 3 else 0
+            self.do_request(TMCC2EngineCommandEnum.BELL_ONE_SHOT_DING, tmcc_id, ding)
+        return ok_response(f"{self.title} {tmcc_id} ringing bell...")
 
     def smoke(self, tmcc_id: int, level: SmokeOption) -> StatusResponse:
         if self.is_tmcc(tmcc_id):
@@ -585,16 +662,9 @@ class PyTrainEngine(PyTrainComponent):
                 self.do_request(TMCC1EngineCommandEnum.SMOKE_OFF, tmcc_id)
             else:
                 self.do_request(TMCC1EngineCommandEnum.SMOKE_ON, tmcc_id)
-        else:
-            if level is None or level == SmokeOption.OFF:
-                self.do_request(TMCC2EffectsControl.SMOKE_OFF, tmcc_id)
-            elif level == SmokeOption.ON or level == SmokeOption.LOW:
-                self.do_request(TMCC2EffectsControl.SMOKE_LOW, tmcc_id)
-            elif level == SmokeOption.MEDIUM:
-                self.do_request(TMCC2EffectsControl.SMOKE_MEDIUM, tmcc_id)
-            elif level == SmokeOption.HIGH:
-                self.do_request(TMCC2EffectsControl.SMOKE_HIGH, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} Smoke: {level}...")
+        elif level in TMCC2_SMOKE_MAP:
+            self.do_request(TMCC2_SMOKE_MAP[level], tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} Smoke: {level}...")
 
     def stop_all(self) -> StatusResponse:
         self.do_request(TMCC1EngineCommandEnum.STOP_IMMEDIATE, 99)
@@ -602,25 +672,16 @@ class PyTrainEngine(PyTrainComponent):
         return ok_response("Sent 'stop' command to all engines and trains...")
 
     def toggle_direction(self, tmcc_id: int) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.TOGGLE_DIRECTION, tmcc_id)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.TOGGLE_DIRECTION, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} toggle direction...")
+        self.do_request(self.commands(tmcc_id).TOGGLE_DIRECTION, tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} toggle direction...")
 
     def volume_up(self, tmcc_id: int) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.VOLUME_UP, tmcc_id)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.VOLUME_UP, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} volume up...")
+        self.do_request(self.commands(tmcc_id).VOLUME_UP, tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} volume up...")
 
     def volume_down(self, tmcc_id: int) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            self.do_request(TMCC1EngineCommandEnum.VOLUME_DOWN, tmcc_id)
-        else:
-            self.do_request(TMCC2EngineCommandEnum.VOLUME_DOWN, tmcc_id)
-        return ok_response(f"{self.scope.title} {tmcc_id} volume down...")
+        self.do_request(self.commands(tmcc_id).VOLUME_DOWN, tmcc_id)
+        return ok_response(f"{self.title} {tmcc_id} volume down...")
 
     def blow_horn(
         self, tmcc_id: int, option: HornOption, intensity: int = 10, duration: float = None
@@ -634,14 +695,14 @@ class PyTrainEngine(PyTrainComponent):
                 self.do_request(SequenceCommandEnum.GRADE_CROSSING_SEQ, tmcc_id)
             elif option == HornOption.QUILLING:
                 self.do_request(TMCC2EngineCommandEnum.QUILLING_HORN, tmcc_id, intensity, duration=duration)
-        return ok_response(f"{self.scope.title} {tmcc_id} blowing horn...")
+        return ok_response(f"{self.title} {tmcc_id} blowing horn...")
 
     def aux(self, tmcc_id, aux: AuxOption, number, duration) -> StatusResponse:
         if self.is_tmcc(tmcc_id):
-            cmd = TMCC1EngineCommandEnum.by_name(f"{aux.name}_OPTION_ONE")
+            cmd = TMCC1_AUX_MAP.get(aux)
             cmd2 = TMCC1EngineCommandEnum.NUMERIC
         else:
-            cmd = TMCC2EngineCommandEnum.by_name(f"{aux.name}_OPTION_ONE")
+            cmd = TMCC2_AUX_MAP.get(aux)
             cmd2 = TMCC2EngineCommandEnum.NUMERIC
         if cmd:
             if number is not None:
@@ -650,34 +711,24 @@ class PyTrainEngine(PyTrainComponent):
             else:
                 self.do_request(cmd, tmcc_id, duration=duration)
             d = f" for {duration} second(s)" if duration else ""
-            return ok_response(f"Sending {aux.name} to {self.scope.title} {tmcc_id}{d}")
+            return ok_response(f"Sending {aux.name} to {self.title} {tmcc_id}{d}")
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Aux option '{aux.value}' not supported on {self.scope.title} {tmcc_id}",
+                detail=f"Aux option '{aux.value}' not supported on {self.title} {tmcc_id}",
             )
 
     def numeric(self, tmcc_id, number, duration) -> StatusResponse:
-        cmd = TMCC1EngineCommandEnum.NUMERIC if self.is_tmcc(tmcc_id) else TMCC2EngineCommandEnum.NUMERIC
+        cmd = self.commands(tmcc_id).NUMERIC
         return self.do_numeric(cmd, tmcc_id, number, duration)
 
     def boost(self, tmcc_id, duration) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            cmd = TMCC1EngineCommandEnum.BOOST_SPEED
-        else:
-            cmd = TMCC2EngineCommandEnum.BOOST_SPEED
-        self.do_request(cmd, tmcc_id, duration=duration)
-        d = f" for {duration} second(s)" if duration else ""
-        return ok_response(f"Sending Boost request to {self.scope.title} {tmcc_id}{d}")
+        self.do_request(self.commands(tmcc_id).BOOST_SPEED, tmcc_id, duration=duration)
+        return self.timed_response(self._boost_prefix, tmcc_id, duration)
 
     def brake(self, tmcc_id, duration) -> StatusResponse:
-        if self.is_tmcc(tmcc_id):
-            cmd = TMCC1EngineCommandEnum.BRAKE_SPEED
-        else:
-            cmd = TMCC2EngineCommandEnum.BRAKE_SPEED
-        self.do_request(cmd, tmcc_id, duration=duration)
-        d = f" for {duration} second(s)" if duration else ""
-        return ok_response(f"Sending Brake request to {self.scope.title} {tmcc_id}{d}")
+        self.do_request(self.commands(tmcc_id).BRAKE_SPEED, tmcc_id, duration=duration)
+        return self.timed_response(self._brake_prefix, tmcc_id, duration)
 
     def get_engine_info(self, tmcc_id) -> dict:
         state = self.state_store.query(self.scope, tmcc_id)
@@ -112,27 +112,31 @@ class BlockInfo(BaseModel):
     occupied_by: MotiveInfo | None
 
 
+_ACC_AUX_FIELDS = ("aux", "aux1", "aux2")
+_ACC_FIELDS = frozenset(_ACC_AUX_FIELDS + ("type", "lcs"))
+_ACC_SCOPES = frozenset(("acc", "sensor_track", "sensor track", "power_district", "power district"))
+
+
 class AccessoryInfo(ComponentInfo):
     # noinspection PyMethodParameters
     @model_validator(mode="before")
     def validate_model(cls, data: Any) -> Any:
         if isinstance(data, dict):
-            for field in {"aux", "aux1", "aux2"}:
-                if field not in data:
-                    data[field] = None
+            # already in canonical shape; nothing to fill in or rename
+            if "state" not in data and _ACC_FIELDS <= data.keys():
+                return data
+            for field in _ACC_AUX_FIELDS:
+                data.setdefault(field, None)
             if "state" in data:
-                data["aux"] = data["state"]
-                del data["state"]
-            if "type" not in data:
-                data["type"] = "accessory"
-            if "lcs" not in data:
-                data["lcs"] = None
+                data["aux"] = data.pop("state")
+            data.setdefault("type", "accessory")
+            data.setdefault("lcs", None)
         return data
 
     # noinspection PyMethodParameters
     @field_validator("scope", mode="before")
     def validate_component(cls, v: str) -> str:
-        return "accessory" if v in {"acc", "sensor_track", "sensor track", "power_district", "power district"} else v
+        return "accessory" if v in _ACC_SCOPES else v
 
     scope: Component = Component.ACCESSORY
     type: str | None
@@ -251,6 +255,16 @@ class TrainInfo(EngineInfo):
     components: dict[int, str] | None
 
 
+class ComponentRef(BaseModel):
+    model_config = command_config(
+        examples=[
+            {"scope": "engine", "tmcc_id": 12},
+        ]
+    )
+    scope: Component
+    tmcc_id: Annotated[int, Field(title="TMCC ID", description="TMCC ID, or Block ID for blocks", ge=1, le=9999)]
+
+
 class HornGrade(BaseModel):
     model_config = command_config(
         examples=[
@@ -34,3 +34,9 @@ StatusResponse = SuccessResponse | ErrorResponse
 class VersionResponse(BaseModel):
     pytrain: str = Field(..., description="PyTrain version")
     pytrain_api: str = Field(..., description="PyTrain API version")
+
+
+class ApiTokenResponse(BaseModel):
+    api_token: str = Field(..., alias="api-token", description="API token issued to the caller")
+    pytrain: str = Field(..., description="PyTrain version")
+    pytrain_api: str = Field(..., description="PyTrain API version")
@@ -10,12 +10,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 import re
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 from fastapi.routing import APIRoute
+from pytrain import (
+    CommandReq,
+    CommandScope,
+    TMCC1RouteCommandEnum,
+    TMCC1SwitchCommandEnum,
+    TMCC2EngineCommandEnum,
+)
+from pytrain.db.component_state import RouteState, SwitchState
 
 from src.pytrain_api import endpoints
+from src.pytrain_api.pytrain_component import SWITCH_COMMANDS
 
 
 def _all_routes(prefix: str | None = None) -> list[tuple[str, str]]:
@@ -30,6 +47,11 @@ def _all_routes(prefix: str | None = None) -> list[tuple[str, str]]:
     return routes
 
 
+def _request(headers: dict[str, str] = None, path: str = "/") -> endpoints.Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return endpoints.Request({"type": "http", "method": "GET", "path": path, "headers": raw})
+
+
 AUTH_ROUTES = _all_routes("/pytrain/v1")
 ALL_ROUTES = _all_routes()
 
@@ -77,3 +99,503 @@ class TestPyTrainApi:
                 continue
             normalized_path = re.sub(r":int(?=})", "", path)
             assert normalized_path in openapi_paths
+
+    def test_openapi_json_is_served_prebuilt(self):
+        response = asyncio.run(endpoints.openapi_schema())
+        assert response.body is endpoints.openapi_json()
+        assert json.loads(response.body) == endpoints.app.openapi()
+        assert response.headers["cache-control"] == endpoints.DOCS_CACHE_CONTROL
+
+    def test_redoc_is_served(self):
+        response = asyncio.run(endpoints.redoc_html())
+        assert response.status_code == 200
+        assert b"/openapi.json" in response.body
+        assert response.headers["cache-control"] == endpoints.DOCS_CACHE_CONTROL
+
+    def test_favicon_is_served_from_memory_with_etag(self):
+        if endpoints.FAVICON.content is None:
+            pytest.skip("No static directory available")
+
+        response = asyncio.run(endpoints.favicon(_request(path="/favicon.ico")))
+        assert response.status_code == 200
+        assert response.body == endpoints.FAVICON.content
+        assert response.headers["cache-control"] == endpoints.ICON_CACHE_CONTROL
+        etag = response.headers["etag"]
+        response = asyncio.run(endpoints.favicon(_request({"If-None-Match": etag}, "/favicon.ico")))
+        assert response.status_code == 304
+        assert not response.body
+
+    @pytest.mark.parametrize(
+        "header, matches",
+        [
+            (None, False),
+            ('W/"abc"', True),
+            ('"abc"', True),
+            ('"xyz", W/"abc"', True),
+            ("*", True),
+            ('"xyz"', False),
+        ],
+    )
+    def test_if_none_match_is_compared_weakly(self, header, matches):
+        request = _request({"If-None-Match": header} if header else None)
+        assert endpoints.etag_matches(request, 'W/"abc"') is matches
+
+    @pytest.mark.parametrize(
+        "headers, code, detail",
+        [(None, 403, "Forbidden"), ({"X-Error": "404"}, 404, "Not Found")],
+    )
+    def test_unknown_paths_are_forbidden(self, headers, code, detail):
+        exc = endpoints.StarletteHTTPException(404, headers=headers)
+        response = asyncio.run(endpoints.http_exception_handler(None, exc))
+        assert response.status_code == code
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"detail": detail}
+
+
+# imports endpoints in a fresh interpreter, since profiling is wired up at import time, and
+# prints whether the profiling middleware and pyinstrument are loaded, then the reply to
+# GET /docs?profile=1 as "status content-type is-report"
+_PROFILE_PROBE = """
+import asyncio, sys
+from src.pytrain_api import endpoints
+
+dispatch = [m.kwargs.get("dispatch") for m in endpoints.app.user_middleware]
+print(any(getattr(d, "__name__", None) == "profile_request" for d in dispatch), "pyinstrument" in sys.modules)
+
+async def get():
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/docs", "query_string": b"profile=1", "headers": []}
+    await endpoints.app(scope, receive, send)
+    media_type = dict(sent[0]["headers"])[b"content-type"].decode().split(";")[0]
+    print(sent[0]["status"], media_type, b"pyinstrument" in sent[1]["body"].lower())
+
+asyncio.run(get())
+"""
+
+
+def _profile_probe(**env: str) -> list[str]:
+    environ = {k: v for k, v in os.environ.items() if k != "PYTRAIN_PROFILE"}
+    result = subprocess.run(
+        [sys.executable, "-c", _PROFILE_PROBE],
+        env={**environ, **env},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    # the probe's lines come last; endpoints may log to stdout while it is imported
+    return " ".join(result.stdout.splitlines()[-2:]).split()
+
+
+class TestProfiling:
+    def test_profiling_is_absent_by_default(self):
+        middleware, imported, code, media_type, report = _profile_probe()
+        assert (middleware, imported) == ("False", "False")
+        assert (code, media_type, report) == ("200", "text/html", "False")
+
+    def test_profiled_request_returns_report(self):
+        pytest.importorskip("pyinstrument")
+        middleware, imported, code, media_type, report = _profile_probe(PYTRAIN_PROFILE="1")
+        assert (middleware, imported) == ("True", "True")
+        assert (code, media_type, report) == ("200", "text/html", "True")
+
+
+class TestDecodeApiToken:
+    @pytest.fixture(autouse=True)
+    def _secret(self, monkeypatch):
+        monkeypatch.setattr(endpoints, "SECRET_KEY", "test-secret")
+        monkeypatch.setattr(endpoints, "SIGNING_KEY", b"test-secret")
+        monkeypatch.setattr(endpoints, "ALGORITHM", "HS256")
+        monkeypatch.setattr(endpoints, "ALGORITHMS", ("HS256",))
+        endpoints._JWT_CACHE.clear()
+        yield
+        endpoints._JWT_CACHE.clear()
+
+    def test_verified_token_is_cached(self, monkeypatch):
+        token = endpoints.create_api_token(secret="test-secret")
+        calls = []
+        real_decode = endpoints.jwt.decode
+        monkeypatch.setattr(endpoints.jwt, "decode", lambda *a, **kw: calls.append(a) or real_decode(*a, **kw))
+
+        assert endpoints.decode_api_token(token)["magic"] == endpoints.API_NAME
+        assert endpoints.decode_api_token(token)["magic"] == endpoints.API_NAME
+        assert len(calls) == 1
+
+    def test_bad_signature_is_rejected_from_cache(self, monkeypatch):
+        token = endpoints.create_api_token(secret="other-secret")
+        for _ in range(2):
+            with pytest.raises(endpoints.HTTPException) as exc:
+                endpoints.decode_api_token(token)
+            assert exc.value.status_code == 401
+        assert len(endpoints._JWT_CACHE) == 1
+
+    def test_expired_token_is_not_cached(self):
+        token = endpoints.create_api_token(expires_delta=endpoints.timedelta(minutes=-1), secret="test-secret")
+        with pytest.raises(endpoints.HTTPException) as exc:
+            endpoints.decode_api_token(token)
+        assert exc.value.status_code == 498
+        assert not endpoints._JWT_CACHE
+
+    def test_tokens_are_rejected_without_secret_key(self, monkeypatch):
+        token = endpoints.create_api_token(secret="test-secret")
+        monkeypatch.setattr(endpoints, "SIGNING_KEY", None)
+        with pytest.raises(endpoints.HTTPException) as exc:
+            endpoints.get_api_token(token)
+        assert exc.value.status_code == 401
+        assert not endpoints._JWT_CACHE
+
+    def test_registered_raw_key_is_accepted(self, monkeypatch):
+        monkeypatch.setattr(endpoints, "API_KEYS", {})
+        monkeypatch.setattr(endpoints, "_VALID_TOKENS", set())
+        with pytest.raises(endpoints.HTTPException):
+            endpoints.get_api_token("raw-key")
+        endpoints.register_api_key("raw-key", "raw-key")
+        assert endpoints.get_api_token("raw-key") is True
+        assert endpoints.API_KEYS == {"raw-key": "raw-key"}
+
+    def test_replaced_raw_key_is_rejected(self, monkeypatch):
+        monkeypatch.setattr(endpoints, "API_KEYS", {})
+        monkeypatch.setattr(endpoints, "_VALID_TOKENS", set())
+        endpoints.register_api_key("device", "old-key")
+        endpoints.register_api_key("device", "new-key")
+        assert endpoints.get_api_token("new-key") is True
+        with pytest.raises(endpoints.HTTPException):
+            endpoints.get_api_token("old-key")
+
+    def test_jwt_values_are_not_held_as_raw_keys(self, monkeypatch):
+        monkeypatch.setattr(endpoints, "API_KEYS", {})
+        monkeypatch.setattr(endpoints, "_VALID_TOKENS", set())
+        endpoints.register_api_key("guid", endpoints.create_api_token(secret="test-secret"))
+        assert endpoints._VALID_TOKENS == set()
+
+    def test_raw_api_token_is_accepted(self, monkeypatch):
+        monkeypatch.setattr(endpoints, "_API_TOKEN_BYTES", b"server-token")
+        assert endpoints.get_api_token("server-token") is True
+        with pytest.raises(endpoints.HTTPException):
+            endpoints.get_api_token("server-tokeN")
+
+    @pytest.mark.parametrize("header", ["Bearer raw-key", "bearer  raw-key ", "BEARER raw-key"])
+    def test_bearer_prefix_is_stripped(self, monkeypatch, header):
+        monkeypatch.setattr(endpoints, "_VALID_TOKENS", {"raw-key"})
+        assert endpoints.get_api_token(header) is True
+
+    def test_guid_token_is_registered(self, monkeypatch):
+        monkeypatch.setattr(endpoints, "API_SERVER", "layout.example.com")
+        monkeypatch.setattr(endpoints, "API_KEYS", {})
+        monkeypatch.setattr(endpoints, "_VALID_TOKENS", set())
+        token = endpoints.create_api_token(
+            {"GUID": "abc", "SERVER": "Layout.Example.com"},
+            secret="test-secret",
+            magic=endpoints.GUID_BOOTSTRAP,
+        )
+        assert endpoints.get_api_token(token) is True
+        assert endpoints.API_KEYS == {"abc": token}
+
+    def test_token_without_magic_is_rejected(self):
+        token = endpoints.jwt.encode({"exp": int(time.time()) + 60}, "test-secret")
+        with pytest.raises(endpoints.HTTPException) as exc:
+            endpoints.decode_api_token(token)
+        assert exc.value.status_code == 401
+
+
+def _route_on_switch() -> tuple[RouteState, SwitchState]:
+    """
+    Returns route 5, active while switch 3 is thru, and the switch, thrown out.
+    """
+    switch = SwitchState(CommandScope.SWITCH)
+    switch.update(CommandReq(TMCC1SwitchCommandEnum.OUT, 3))
+    route = RouteState(CommandScope.ROUTE)
+    route.update(CommandReq(TMCC1RouteCommandEnum.FIRE, 5))
+    route._signature["S3"] = True
+    route._current_state["S3"] = switch.is_thru
+    switch.register_route(route)
+    return route, switch
+
+
+class _FakeState(SimpleNamespace):
+    def __str__(self) -> str:
+        return self.name
+
+    def as_dict(self) -> dict:
+        return {"tmcc_id": self.address, "name": self.name}
+
+
+class TestGetComponents:
+    @pytest.fixture(autouse=True)
+    def _store(self, monkeypatch):
+        self.states = [
+            _FakeState(address=1, last_updated=1.0, is_legacy=True, is_tmcc=False, name="Big Boy"),
+            _FakeState(address=2, last_updated=1.0, is_legacy=False, is_tmcc=True, name="GP9"),
+        ]
+        pytrain = MagicMock()
+        pytrain.store.query.side_effect = lambda scope: list(self.states)
+        monkeypatch.setattr(endpoints, "_PYTRAIN", pytrain)
+        for cache in (
+            endpoints._COMPONENT_INDEX,
+            endpoints._LIST_BODIES,
+            endpoints._STATE_DICTS,
+            endpoints._STATE_BODIES,
+        ):
+            cache.clear()
+        yield
+        for cache in (
+            endpoints._COMPONENT_INDEX,
+            endpoints._LIST_BODIES,
+            endpoints._STATE_DICTS,
+            endpoints._STATE_BODIES,
+        ):
+            cache.clear()
+
+    def test_filters_by_flags_and_text(self):
+        def names(**kwargs) -> list[str]:
+            return [d["name"] for d in endpoints.get_components(CommandScope.ENGINE, **kwargs)]
+
+        assert names() == ["Big Boy", "GP9"]
+        assert names(is_legacy=True) == ["Big Boy"]
+        assert names(is_tmcc=True) == ["GP9"]
+        assert names(contains="BIG") == ["Big Boy"]
+        assert names(is_legacy=True, is_tmcc=False) == ["Big Boy"]
+        with pytest.raises(endpoints.HTTPException):
+            names(is_legacy=True, is_tmcc=True)
+        with pytest.raises(endpoints.HTTPException) as exc:
+            endpoints.get_components(CommandScope.ENGINE, contains="big", is_tmcc=True)
+        assert exc.value.status_code == 404
+
+    def test_index_is_rebuilt_when_a_state_changes(self):
+        assert endpoints.get_components(CommandScope.ENGINE, contains="gp9")
+        index = endpoints._COMPONENT_INDEX[CommandScope.ENGINE]
+        endpoints.get_components(CommandScope.ENGINE, contains="gp9")
+        assert endpoints._COMPONENT_INDEX[CommandScope.ENGINE] is index
+
+        self.states[1].name = "SD40"
+        self.states[1].last_updated = 2.0
+        assert [d["name"] for d in endpoints.get_components(CommandScope.ENGINE, contains="sd40")] == ["SD40"]
+        assert endpoints._COMPONENT_INDEX[CommandScope.ENGINE] is not index
+
+    def test_route_search_follows_its_switches(self):
+        route, switch = _route_on_switch()
+        self.states = [route]
+        with pytest.raises(endpoints.HTTPException):
+            endpoints.get_components(CommandScope.ROUTE, contains="active: true")
+
+        switch.update(CommandReq(TMCC1SwitchCommandEnum.THRU, 3))
+        assert [d["tmcc_id"] for d in endpoints.get_components(CommandScope.ROUTE, contains="active: true")] == [5]
+
+    def test_list_endpoint_answers_304_for_current_etag(self):
+        adapter = endpoints.TypeAdapter(list[dict])
+        response = endpoints.list_components(
+            _request(path="/pytrain/v1/engines"), CommandScope.ENGINE, adapter, contains="gp"
+        )
+        assert [d["name"] for d in json.loads(response.body)] == ["GP9"]
+        etag = response.headers["etag"]
+
+        cached = endpoints.list_components(
+            _request({"If-None-Match": etag}, "/pytrain/v1/engines"), CommandScope.ENGINE, adapter, contains="gp"
+        )
+        assert cached.status_code == 304
+
+        self.states[1].last_updated = 2.0
+        response = endpoints.list_components(
+            _request({"If-None-Match": etag}, "/pytrain/v1/engines"), CommandScope.ENGINE, adapter, contains="gp"
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_list_body_is_reused_while_scope_is_unchanged(self):
+        request = _request(path="/pytrain/v1/engines")
+        adapter = endpoints.TypeAdapter(list[dict])
+        first = endpoints.list_components(request, CommandScope.ENGINE, adapter)
+        second = endpoints.list_components(request, CommandScope.ENGINE, adapter)
+        assert second.body is first.body
+
+    def test_route_list_body_follows_its_switches(self):
+        route, switch = _route_on_switch()
+        self.states = [route]
+        adapter = endpoints._ROUTE_LIST_ADAPTER
+        first = endpoints.list_components(_request(), CommandScope.ROUTE, adapter)
+        assert json.loads(first.body)[0]["active"] is False
+
+        switch.update(CommandReq(TMCC1SwitchCommandEnum.THRU, 3))
+        second = endpoints.list_components(_request(), CommandScope.ROUTE, adapter)
+        assert json.loads(second.body)[0]["active"] is True
+
+    def test_route_list_etag_changes_when_its_switch_is_thrown(self):
+        route, switch = _route_on_switch()
+        self.states = [route]
+        adapter = endpoints._ROUTE_LIST_ADAPTER
+        etag = endpoints.list_components(_request(), CommandScope.ROUTE, adapter).headers["etag"]
+        cached = endpoints.list_components(_request({"If-None-Match": etag}), CommandScope.ROUTE, adapter)
+        assert cached.status_code == 304
+
+        switch.update(CommandReq(TMCC1SwitchCommandEnum.THRU, 3))
+        response = endpoints.list_components(_request({"If-None-Match": etag}), CommandScope.ROUTE, adapter)
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_state_dict_is_rebuilt_only_after_an_update(self):
+        state = self.states[0]
+        state.as_dict = MagicMock(return_value={"tmcc_id": 1, "name": "Big Boy"})
+        first = endpoints.state_dict(CommandScope.ENGINE, state)
+        first["name"] = "changed"
+        assert endpoints.state_dict(CommandScope.ENGINE, state)["name"] == "Big Boy"
+        assert state.as_dict.call_count == 1
+
+        state.last_updated = 2.0
+        endpoints.state_dict(CommandScope.ENGINE, state)
+        assert state.as_dict.call_count == 2
+
+    def test_route_dict_follows_its_switches(self):
+        route, switch = _route_on_switch()
+        assert endpoints.state_dict(CommandScope.ROUTE, route)["active"] is False
+
+        switch.update(CommandReq(TMCC1SwitchCommandEnum.THRU, 3))
+        assert endpoints.state_dict(CommandScope.ROUTE, route)["active"] is True
+
+    def test_single_component_body_is_reused_until_updated(self):
+        state = _FakeState(address=3, last_updated=1.0, name="Yard")
+        state.as_dict = MagicMock(
+            return_value={"tmcc_id": 3, "road_name": "Yard", "road_number": None, "scope": "switch", "state": "thru"}
+        )
+        switch = endpoints.Switch()
+        switch._state_store = MagicMock()
+        switch._state_store.query.return_value = state
+
+        first = endpoints.get_component(_request(), switch, 3, endpoints.SwitchInfo)
+        assert json.loads(first.body)["state"] == "thru"
+        assert endpoints.get_component(_request(), switch, 3, endpoints.SwitchInfo).body is first.body
+
+        not_modified = endpoints.get_component(
+            _request({"If-None-Match": first.headers["etag"]}), switch, 3, endpoints.SwitchInfo
+        )
+        assert not_modified.status_code == 304
+
+        state.last_updated = 2.0
+        assert endpoints.get_component(_request(), switch, 3, endpoints.SwitchInfo).body is not first.body
+        assert state.as_dict.call_count == 2
+
+    def test_route_body_follows_its_switches(self, monkeypatch):
+        route, switch = _route_on_switch()
+        store = MagicMock()
+        store.query.return_value = route
+        monkeypatch.setattr(endpoints._route, "_state_store", store)
+        batch = [endpoints.ComponentRef(scope="route", tmcc_id=5)]
+        assert json.loads(endpoints.get_route(_request(), 5).body)["active"] is False
+        assert json.loads(endpoints.get_component_batch(batch).body)[0]["active"] is False
+
+        switch.update(CommandReq(TMCC1SwitchCommandEnum.THRU, 3))
+        assert json.loads(endpoints.get_route(_request(), 5).body)["active"] is True
+        assert json.loads(endpoints.get_component_batch(batch).body)[0]["active"] is True
+
+    def test_route_etag_changes_when_its_switch_is_thrown(self, monkeypatch):
+        route, switch = _route_on_switch()
+        store = MagicMock()
+        store.query.return_value = route
+        monkeypatch.setattr(endpoints._route, "_state_store", store)
+        etag = endpoints.get_route(_request(), 5).headers["etag"]
+        assert endpoints.get_route(_request({"If-None-Match": etag}), 5).status_code == 304
+
+        switch.update(CommandReq(TMCC1SwitchCommandEnum.THRU, 3))
+        response = endpoints.get_route(_request({"If-None-Match": etag}), 5)
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert json.loads(response.body)["active"] is True
+
+    def test_single_component_missing_is_404(self):
+        switch = endpoints.Switch()
+        switch._state_store = MagicMock()
+        switch._state_store.query.return_value = None
+
+        with pytest.raises(endpoints.HTTPException) as exc:
+            endpoints.get_component(_request(), switch, 3, endpoints.SwitchInfo)
+        assert exc.value.status_code == 404
+        assert exc.value.headers["X-Error"] == "404"
+
+    def test_batch_returns_states_in_request_order(self, monkeypatch):
+        state = _FakeState(address=3, last_updated=1.0, name="Yard")
+        state.as_dict = MagicMock(
+            return_value={"tmcc_id": 3, "road_name": "Yard", "road_number": None, "scope": "switch", "state": "out"}
+        )
+        store = MagicMock()
+        store.query.side_effect = lambda scope, tmcc_id: state if tmcc_id == 3 else None
+        monkeypatch.setattr(endpoints._switch, "_state_store", store)
+
+        refs = [endpoints.ComponentRef(scope="switch", tmcc_id=i) for i in (4, 3, 3)]
+        response = endpoints.get_component_batch(refs)
+
+        assert response.media_type == "application/json"
+        assert [s and s["state"] for s in json.loads(response.body)] == [None, "out", "out"]
+        assert state.as_dict.call_count == 1
+
+
+class TestCommandReplies:
+    @pytest.mark.parametrize("position", list(endpoints.SwitchPosition))
+    def test_switch_throw_reply_matches_status_model(self, monkeypatch, position):
+        calls = []
+        monkeypatch.setattr(endpoints._switch, "do_request", lambda *args, **kwargs: calls.append(args))
+
+        response = endpoints.throw_cmd(14, position)
+
+        assert calls == [(SWITCH_COMMANDS[position], 14)]
+        assert response.media_type == "application/json"
+        assert response.body == endpoints.ok_response(f"Throwing Switch 14 {position.value}").model_dump_json().encode()
+        assert endpoints._switch.throw(15, position).status == f"Throwing Switch 15 {position.value}"
+
+    def test_route_fire_reply_matches_status_model(self, monkeypatch):
+        monkeypatch.setattr(endpoints._route, "do_request", lambda *args, **kwargs: None)
+
+        response = endpoints.fire(250)
+
+        assert json.loads(response.body) == {"status": "Route 250 fired"}
+
+
+class TestParseCli:
+    @pytest.fixture(autouse=True)
+    def _pytrain(self, monkeypatch):
+        self.pytrain = MagicMock()
+        monkeypatch.setattr(endpoints, "_PYTRAIN", self.pytrain)
+        endpoints._CLI_CACHE.clear()
+        yield
+        endpoints._CLI_CACHE.clear()
+
+    def test_parsed_request_is_reused(self):
+        req = CommandReq(TMCC2EngineCommandEnum.RING_BELL, 7)
+        self.pytrain.parse_cli.return_value = req
+
+        assert endpoints.parse_cli("engine 7 ring") is req
+        assert endpoints.parse_cli("engine 7 ring") is req
+        assert self.pytrain.parse_cli.call_count == 1
+
+    def test_errors_are_not_cached(self):
+        self.pytrain.parse_cli.return_value = "Command is invalid"
+
+        assert endpoints.parse_cli("engine 7 bogus") == "Command is invalid"
+        assert endpoints.parse_cli("engine 7 bogus") == "Command is invalid"
+        assert self.pytrain.parse_cli.call_count == 2
+
+
+class TestSystemToggles:
+    @pytest.mark.parametrize(
+        "handler, on, cmd, status",
+        [
+            (endpoints.debug, True, "debug on", "Debugging enabled"),
+            (endpoints.debug, False, "debug off", "Debugging disabled"),
+            (endpoints.echo, True, "echo on", "Echo enabled"),
+            (endpoints.echo, False, "echo off", "Echo disabled"),
+        ],
+    )
+    def test_toggle_queues_command_and_reports_state(self, monkeypatch, handler, on, cmd, status):
+        pytrain = MagicMock()
+        monkeypatch.setattr(endpoints, "_PYTRAIN", pytrain)
+
+        response = handler(on=on)
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"status": status}
+        pytrain.queue_command.assert_called_once_with(cmd)
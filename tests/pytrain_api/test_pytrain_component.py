@@ -14,9 +14,31 @@ from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException
-from pytrain import CommandReq, CommandScope, TMCC1AuxCommandEnum, TMCC1EngineCommandEnum, TMCC2EngineCommandEnum
-
-from src.pytrain_api.pytrain_component import OnOffOption, PyTrainAccessory, PyTrainComponent, PyTrainEngine
+from pytrain import (
+    CommandReq,
+    CommandScope,
+    TMCC1AuxCommandEnum,
+    TMCC1EngineCommandEnum,
+    TMCC1SwitchCommandEnum,
+    TMCC2EngineCommandEnum,
+)
+
+from src.pytrain_api import pytrain_component
+from src.pytrain_api.pytrain_component import (
+    ACC_AUX_MAP,
+    LEGACY_RR_SPEED_STEPS,
+    TMCC_RR_SPEED_STEPS,
+    AuxOption,
+    OnOffOption,
+    PyTrainAccessory,
+    PyTrainComponent,
+    TMCC2_SMOKE_MAP,
+    PyTrainEngine,
+    PyTrainSwitch,
+    SmokeOption,
+    SwitchPosition,
+    pooled_request,
+)
 
 
 class TestPyTrainEngine:
@@ -72,6 +94,40 @@ class TestPyTrainEngine:
         assert called["tmcc_id"] == 12
         assert called["number"] == 7
 
+    def test_immediate_speed_uses_tmcc1_absolute_speed_for_tmcc_engine(self, monkeypatch):
+        sent: list[CommandReq] = []
+        monkeypatch.setattr(self.engine, "is_tmcc", lambda _tmcc_id: True)
+        monkeypatch.setattr(self.engine, "do_request", lambda cmd, *args, **kwargs: sent.append(cmd))
+
+        result = self.engine.speed(12, 10, immediate=True)
+
+        assert sent[0].command == TMCC1EngineCommandEnum.ABSOLUTE_SPEED
+        assert result.status == "Engine 12 speed now: 10"
+
+    @pytest.mark.parametrize("is_tmcc, steps", [(True, TMCC_RR_SPEED_STEPS), (False, LEGACY_RR_SPEED_STEPS)])
+    def test_railroad_speeds_map_to_speed_steps(self, monkeypatch, is_tmcc, steps):
+        sent: list[CommandReq] = []
+        monkeypatch.setattr(self.engine, "is_tmcc", lambda _tmcc_id: is_tmcc)
+        monkeypatch.setattr(self.engine, "do_request", lambda cmd, *args, **kwargs: sent.append(cmd))
+
+        for speed in range(201, 208):
+            self.engine.speed(12, speed, immediate=True)
+
+        assert tuple(req.data for req in sent) == steps
+
+    @pytest.mark.parametrize("is_tmcc, enum", [(True, TMCC1EngineCommandEnum), (False, TMCC2EngineCommandEnum)])
+    def test_named_speeds_resolve_case_insensitively(self, monkeypatch, is_tmcc, enum):
+        sent: list[CommandReq] = []
+        monkeypatch.setattr(self.engine, "is_tmcc", lambda _tmcc_id: is_tmcc)
+        monkeypatch.setattr(self.engine, "do_request", lambda cmd, *args, **kwargs: sent.append(cmd))
+
+        self.engine.speed(12, "Highball")
+        with pytest.raises(HTTPException) as exc:
+            self.engine.speed(12, "warp")
+
+        assert sent[0].command == enum.SPEED_HIGHBALL
+        assert exc.value.status_code == 400
+
     def test_get_engine_info_returns_prod_info_for_bt_id(self, monkeypatch):
         self.engine._state_store = MagicMock()
         self.engine._state_store.query.return_value = SimpleNamespace(bt_id="BT-001")
@@ -91,10 +147,52 @@ class TestPyTrainEngine:
 
         assert self.engine.get_engine_info(7) == prod_info
 
+    @pytest.mark.parametrize(
+        "option, expected",
+        [(None, TMCC2EngineCommandEnum.RING_BELL), ("on", TMCC2EngineCommandEnum.BELL_ON)],
+    )
+    def test_ring_bell_dispatches_legacy_commands(self, monkeypatch, option, expected):
+        calls = []
+        monkeypatch.setattr(self.engine, "is_tmcc", lambda _tmcc_id: False)
+        monkeypatch.setattr(self.engine, "do_request", lambda *args, **kwargs: calls.append(args))
+
+        self.engine.ring_bell(9, option)
+
+        assert calls == [(expected, 9)]
+
+    def test_smoke_dispatches_legacy_levels(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(self.engine, "is_tmcc", lambda _tmcc_id: False)
+        monkeypatch.setattr(self.engine, "do_request", lambda *args, **kwargs: calls.append(args))
+
+        for level in SmokeOption:
+            self.engine.smoke(9, level)
+
+        assert calls == [(TMCC2_SMOKE_MAP[level], 9) for level in SmokeOption]
+
+    @pytest.mark.parametrize("is_tmcc, enum", [(True, TMCC1EngineCommandEnum), (False, TMCC2EngineCommandEnum)])
+    @pytest.mark.parametrize(
+        "method, name",
+        [("stop", "STOP_IMMEDIATE"), ("forward", "FORWARD_DIRECTION"), ("volume_down", "VOLUME_DOWN")],
+    )
+    def test_common_commands_follow_protocol(self, monkeypatch, is_tmcc, enum, method, name):
+        calls = []
+        monkeypatch.setattr(self.engine, "is_tmcc", lambda _tmcc_id: is_tmcc)
+        monkeypatch.setattr(self.engine, "do_request", lambda *args, **kwargs: calls.append(args))
+
+        getattr(self.engine, method)(9)
+
+        assert calls == [(enum[name], 9)]
+
 
 class TestPyTrainComponent:
     def setup_method(self):
         self.component = PyTrainComponent(scope=CommandScope.ENGINE)
+        pytrain_component._REQ_POOL.clear()
+
+    def test_id_path_is_built_once_per_label(self):
+        assert PyTrainComponent.id_path(label="Engine") is PyTrainComponent.id_path(label="Engine")
+        assert PyTrainComponent.id_path(label="Engine") is not PyTrainComponent.id_path(label="Train")
 
     def test_get_raises_not_found_when_state_missing(self):
         self.component._state_store = MagicMock()
@@ -124,6 +222,20 @@ class TestPyTrainComponent:
         assert build_calls == [(TMCC1EngineCommandEnum.FORWARD_DIRECTION, 5, None, CommandScope.ENGINE)]
         fake_req.send.assert_called_once_with(repeat=1, delay=0, duration=0)
 
+    def test_pooled_request_reuses_plain_requests(self):
+        req = pooled_request(TMCC2EngineCommandEnum.BLOW_HORN_ONE, 7, None, CommandScope.ENGINE)
+
+        assert pooled_request(TMCC2EngineCommandEnum.BLOW_HORN_ONE, 7, None, CommandScope.ENGINE) is req
+        assert pooled_request(TMCC2EngineCommandEnum.BLOW_HORN_ONE, 8, None, CommandScope.ENGINE) is not req
+
+    def test_pooled_request_builds_other_request_types_fresh(self, monkeypatch):
+        monkeypatch.setattr(CommandReq, "build", lambda *_args: MagicMock())
+
+        first = pooled_request(TMCC2EngineCommandEnum.BLOW_HORN_ONE, 7, None, CommandScope.ENGINE)
+
+        assert pooled_request(TMCC2EngineCommandEnum.BLOW_HORN_ONE, 7, None, CommandScope.ENGINE) is not first
+        assert not pytrain_component._REQ_POOL
+
     def test_do_request_wraps_exceptions_as_http_400(self, monkeypatch):
         monkeypatch.setattr(
             CommandReq, "build", lambda *_args, **_kwargs: (_ for _ in ()).throw(ValueError("bad command"))
@@ -136,6 +248,22 @@ class TestPyTrainComponent:
         assert "bad command" in exc.value.detail
 
 
+class TestPyTrainSwitch:
+    @pytest.mark.parametrize(
+        "position, expected",
+        [(SwitchPosition.THRU, TMCC1SwitchCommandEnum.THRU), (SwitchPosition.OUT, TMCC1SwitchCommandEnum.OUT)],
+    )
+    def test_throw_sends_position_and_reports_it(self, monkeypatch, position, expected):
+        switch = PyTrainSwitch(CommandScope.SWITCH)
+        calls = []
+        monkeypatch.setattr(switch, "do_request", lambda *args, **kwargs: calls.append(args))
+
+        result = switch.throw(14, position)
+
+        assert calls == [(expected, 14)]
+        assert result.status == f"Throwing Switch 14 {position.value}"
+
+
 class TestPyTrainAccessory:
     def setup_method(self):
         self.accessory = PyTrainAccessory(scope=CommandScope.ACC)
@@ -168,3 +296,22 @@ class TestPyTrainAccessory:
 
         assert exc.value.status_code == 422
         assert "Must specify either motor state or speed" in exc.value.detail
+
+    def test_boost_status_with_and_without_duration(self, monkeypatch):
+        monkeypatch.setattr(self.accessory, "do_request", lambda *args, **kwargs: None)
+
+        assert self.accessory.boost(7).status == "Sending Boost request to Accessory 7"
+        assert self.accessory.brake(7, 1.5).status == "Sending Brake request to Accessory 7 for 1.5 second(s)"
+
+
+class TestAuxMaps:
+    def test_accessory_aux_map_skips_unsupported_options(self):
+        assert ACC_AUX_MAP == {
+            AuxOption.AUX1: TMCC1AuxCommandEnum.AUX1_OPT_ONE,
+            AuxOption.AUX2: TMCC1AuxCommandEnum.AUX2_OPT_ONE,
+        }
+
+    def test_accessory_aux3_is_rejected(self):
+        with pytest.raises(HTTPException) as exc:
+            PyTrainAccessory(CommandScope.ACC).aux(5, AuxOption.AUX3)
+        assert exc.value.status_code == 400